@@ -1,15 +1,140 @@
 import re
+from collections import OrderedDict
 
+import numpy as np
 import pandas as pd
+from decorators.cache_decorator import bumps_version, memoize_result
 from decorators.types_decorator import check_args_types
+from sketches import HyperLogLog, SketchStore, TDigest
 from UrlEMT.UrlEMT import UrlEMT
 
+from .database import TripsDatabase
+from .geo import parse_coordinates
+from .nearest import StationIndex, station_coordinates
+from .sampling import estimate_totals, stratified_sample
+from .schemas import get_schema, parse_csv, read_chunks
+from .shared import SharedDataset, attach
+from .speed import MAX_SPEED_KMH, speed_aggregates, trip_speeds
+from .stations import join_stations, normalize_stations, station_column
+from .validation import MAX_TRIP_MINUTES, validate
+
 
 class BiciMad:
-    def __init__(self, month: int, year: int) -> None:
+    # Default number of memoized analysis results kept per instance.
+    CACHE_SIZE = 32
+
+    # Rows parsed at once when streaming a CSV for sampling.
+    SAMPLE_CHUNKSIZE = 100_000
+
+    def __init__(
+        self,
+        month: int,
+        year: int,
+        validate: bool = False,
+        cache_size: int = CACHE_SIZE,
+        sample_size: int | None = None,
+        seed: int = 0,
+    ) -> None:
+        errors = "coerce" if validate else "raise"
+        if sample_size is None:
+            self._setup(month, year, BiciMad.get_data(month, year, errors))
+        else:
+            data, strata = BiciMad.get_sample(month, year, sample_size, seed, errors)
+            self._setup(month, year, data, strata)
+        self._cache_size = cache_size
+        if validate:
+            self.validate()
+
+    def _setup(
+        self, month: int, year: int, data: pd.DataFrame, strata: pd.DataFrame | None = None
+    ) -> None:
         self._month = month
         self._year = year
-        self._data = BiciMad.get_data(month, year)
+        self._data = data
+        self._strata = strata
+        self._shared_blocks = None
+        self._quarantine = None
+        self._stations = None
+        # Data version, bumped by every mutating method to invalidate memoized results.
+        self._version = 0
+        self._clean_version = None
+        self._cache = OrderedDict()
+        self._cache_size = BiciMad.CACHE_SIZE
+
+    @classmethod
+    def from_dataframe(
+        cls, month: int, year: int, data: pd.DataFrame, strata: pd.DataFrame | None = None
+    ) -> "BiciMad":
+        """
+        Builds a BiciMad instance around an already loaded DataFrame, without downloading it.
+
+        Args:
+            month (int): The month the data belongs to (1-12).
+            year (int): The year the data belongs to (21-23).
+            data (pd.DataFrame): A DataFrame with the layout returned by `get_data`.
+            strata (pd.DataFrame | None): If the data is a stratified sample, its strata as
+                returned by `get_sample`.
+
+        Returns:
+            BiciMad: The new instance.
+        """
+        instance = cls.__new__(cls)
+        instance._setup(month, year, data, strata)
+        return instance
+
+    @classmethod
+    def attach(cls, spec: dict) -> "BiciMad":
+        """
+        Builds a read-only BiciMad instance over a dataset published in shared memory by
+        `publish`, without copying the data into this process.
+
+        Args:
+            spec (dict): The `spec` of the published `SharedDataset`.
+
+        Returns:
+            BiciMad: The new instance. Its data is already clean, so `clean` is a no-op. `close`
+                it (or use it as a context manager) to release the shared blocks.
+        """
+        data, stations, blocks = attach(spec)
+        instance = cls.from_dataframe(spec["month"], spec["year"], data)
+        instance._stations = stations
+        instance._shared_blocks = blocks
+        return instance
+
+    def close(self) -> None:
+        """
+        Releases the shared memory blocks of an instance built with `attach`, dropping its data,
+        so it cannot be used afterwards. DataFrames taken from it must no longer be referenced.
+        Does nothing on instances holding their own data.
+        """
+        if self._shared_blocks is None:
+            return
+        self._data = self._stations = None
+        self._cache.clear()
+        blocks, self._shared_blocks = self._shared_blocks, None
+        for block in blocks:
+            block.close()
+
+    def __enter__(self) -> "BiciMad":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def publish(self) -> SharedDataset:
+        """
+        Cleans the data and publishes it in shared memory so worker processes can `attach`
+        zero-copy views instead of loading their own copy.
+
+        String columns are published as categoricals. Normalized data is published along with
+        its station table.
+
+        Returns:
+            SharedDataset: The published dataset. Pass its `spec` to the workers and `unlink` it
+                (or use it as a context manager) once they are done.
+        """
+        self.clean()
+        return SharedDataset.publish(self.data, self.month, self.year, self._stations)
 
     @property
     def month(self) -> int:
@@ -23,9 +148,42 @@ class BiciMad:
     def data(self) -> int:
         return self._data
 
+    @property
+    def quarantine(self) -> pd.DataFrame | None:
+        return self._quarantine
+
+    @property
+    def strata(self) -> pd.DataFrame | None:
+        return self._strata
+
+    @property
+    def stations(self) -> pd.DataFrame | None:
+        return self._stations
+
+    @property
+    def cache_size(self) -> int:
+        return self._cache_size
+
+    @cache_size.setter
+    def cache_size(self, size: int) -> None:
+        """
+        Sets the maximum number of memoized results, 0 disables the cache.
+        """
+        self._cache_size = size
+        while len(self._cache) > max(size, 0):
+            self._cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """
+        Drops every memoized result. Only needed after modifying `data` directly, since the
+        BiciMad mutating methods already invalidate the cache.
+        """
+        self._cache.clear()
+        self._version += 1
+
     @staticmethod
     @check_args_types
-    def get_data(month: int, year: int) -> pd.DataFrame:
+    def get_data(month: int, year: int, errors: str = "raise") -> pd.DataFrame:
         """
         Retrieves data from a CSV related to BiciMad bike usage for a specific month and year,
         processing the information into a DataFrame.
@@ -33,6 +191,8 @@ class BiciMad:
         Args:
             month (int): The month for which to retrieve the data (1-12).
             year (int): The year for which to retrieve the data (21-23).
+            errors (str): "raise" to fail on values not matching the schema dtypes or formats,
+                "coerce" to turn them into NaN/NaT so `validate` can quarantine those rows.
 
         Returns:
             pd.DataFrame: A DataFrame containing bike trip data with the following columns:
@@ -52,44 +212,190 @@ class BiciMad:
                 - unlock_station_name (str): The name of the unlock station.
                 - station_lock (int): The ID of the lock station.
                 - lock_station_name (str): The name of the lock station.
+
+        Raises:
+            ValueError: If the month has no registered schema, its file is known to be malformed
+                or its header or values do not match the schema.
         """
+        schema = get_schema(month, year)
         csv_file = UrlEMT().get_csv(month, year)
-        csv_file.seek(0)
-        df = pd.read_csv(
-            csv_file,
-            sep=";",
-            index_col="fecha",
-            parse_dates=["fecha", "unlock_date", "lock_date"],
-            usecols=[
-                "fecha",
-                "idBike",
-                "fleet",
-                "trip_minutes",
-                "geolocation_unlock",
-                "address_unlock",
-                "unlock_date",
-                "locktype",
-                "unlocktype",
-                "geolocation_lock",
-                "address_lock",
-                "lock_date",
-                "station_unlock",
-                "unlock_station_name",
-                "station_lock",
-                "lock_station_name",
-            ],
-        )
+        df = parse_csv(csv_file, schema, errors)
         return df
 
+    @staticmethod
+    @check_args_types
+    def get_sample(
+        month: int, year: int, sample_size: int, seed: int = 0, errors: str = "raise"
+    ) -> tuple:
+        """
+        Streams the CSV of a specific month and year and keeps a reproducible sample of its trips,
+        stratified by day and unlock station, without loading the whole month.
+
+        Memory scales with the sample size: the CSV is decompressed and parsed in chunks of
+        `SAMPLE_CHUNKSIZE` rows and only the sample candidates are kept between chunks.
+
+        Args:
+            month (int): The month for which to retrieve the data (1-12).
+            year (int): The year for which to retrieve the data (21-23).
+            sample_size (int): Target number of sampled trips.
+            seed (int): Seed of the sampling, the same seed always gives the same sample.
+            errors (str): "raise" or "coerce", as in `get_data`.
+
+        Returns:
+            tuple: The sampled trips (pd.DataFrame with the layout returned by `get_data`) and
+                the strata (pd.DataFrame with the exact "population" and "sampled" trips of each
+                stratum).
+        """
+        schema = get_schema(month, year)
+        with UrlEMT().open_csv(month, year) as csv_file:
+            chunks = read_chunks(csv_file, schema, BiciMad.SAMPLE_CHUNKSIZE, errors)
+            return stratified_sample(chunks, sample_size, seed)
+
     def __str__(self) -> str:
         return self.data.__str__()
 
+    @bumps_version
+    @check_args_types
+    def validate(self, max_trip_minutes: int | float = MAX_TRIP_MINUTES) -> pd.Series:
+        """
+        Moves the rows failing any data quality rule out of the DataFrame into the quarantine
+        frame, so bad rows do not reach the analysis. Meant to run between `get_data` and `clean`.
+
+        Every rule is evaluated as a vectorized column mask:
+            - negative_trip_minutes: trip_minutes below 0.
+            - absurd_trip_minutes: trip_minutes above `max_trip_minutes`.
+            - missing_dates: unlock_date or lock_date missing or unparseable.
+            - lock_before_unlock: lock_date earlier than unlock_date.
+            - wrong_month: fecha outside the month and year of the instance.
+            - invalid_numbers: a numeric value that could not be parsed (only detected when the
+            data was loaded with `validate=True`, i.e. `get_data(..., errors="coerce")`).
+            - invalid_geolocation_unlock / invalid_geolocation_lock: missing or unparseable
+            coordinates.
+
+        Args:
+            max_trip_minutes (int | float): Longest plausible trip duration in minutes.
+
+        Returns:
+            pd.Series: The number of failing rows per reason code, and in total. Quarantined rows
+                are available in `quarantine`, with their reason codes in the "reasons" column.
+        """
+        data = self.data
+        geolocations = ["geolocation_unlock", "geolocation_lock"]
+        if self._stations is not None:
+            # The geolocation rules read the coordinates of normalized data from the stations.
+            data = data.assign(**{col: self._column(col) for col in geolocations})
+        valid, quarantine, counts = validate(data, self.month, self.year, max_trip_minutes)
+        if self._stations is not None:
+            valid = valid.drop(columns=geolocations)
+        self._data = valid
+        if self._quarantine is not None:
+            quarantine = pd.concat([self._quarantine, quarantine])
+        self._quarantine = quarantine
+        return counts
+
+    @bumps_version
+    def normalize(self) -> None:
+        """
+        Replaces the station attribute columns of the trips (station ids, station names,
+        addresses and geolocations of both sides) by integer keys into a station dimension
+        table, available in `stations`.
+
+        The station strings are stored once per station instead of once per trip, and station
+        groupings work on integer keys. Analysis methods join the names back on demand.
+
+        Returns:
+            None: The method modifies the DataFrame in place.
+        """
+        if self._stations is not None:
+            return
+        self.clean()
+        self._stations, self._data = normalize_stations(self.data)
+        self._clean_version = self._version
+
+    @bumps_version
+    @check_args_types
+    def assign_dockless_stations(self, max_distance: int | float = 100) -> pd.Series:
+        """
+        Assigns every trip endpoint without station (dockless lock or unlock) to the nearest known
+        station within `max_distance` meters, so station analyses no longer lose those trips.
+
+        Station locations are the median coordinates of the trips docked at them, and all the
+        dockless endpoints are resolved in one batched query over a `StationIndex`. The station
+        name and address of the docked trips are filled in along with the station id, so the
+        assigned trips group with the station's own trips. Works before or after `clean`, but not
+        on normalized data.
+
+        Args:
+            max_distance (int | float): Maximum distance in meters between an endpoint and its
+                assigned station.
+
+        Returns:
+            pd.Series: The number of endpoints assigned on each side ("unlock", "lock").
+
+        Raises:
+            ValueError: If the data is normalized, or if the instance holds a sample (its strata
+                are defined by the original unlock stations).
+        """
+        if self._stations is not None:
+            raise ValueError("Dockless stations have to be assigned before normalizing the data")
+        if self._strata is not None:
+            raise ValueError("Dockless stations cannot be assigned on sampled data")
+        known = station_coordinates(self.data)
+        index = StationIndex(known.index, known["longitude"], known["latitude"], max_distance)
+        docked = pd.concat(
+            [
+                self.data[[f"station_{side}", f"{side}_station_name", f"address_{side}"]].set_axis(
+                    ["station", "name", "address"], axis=1
+                )
+                for side in ["unlock", "lock"]
+            ]
+        )
+        docked["station"] = pd.to_numeric(docked["station"], errors="coerce")
+        # First name and address seen for every station, skipping missing values.
+        docked = docked.dropna(subset=["station"]).groupby("station").first()
+
+        assigned = {}
+        for side in ["unlock", "lock"]:
+            col, name_col = f"station_{side}", f"{side}_station_name"
+            stations = pd.to_numeric(self.data[col], errors="coerce").to_numpy()
+            geolocations = self.data[f"geolocation_{side}"]
+            dockless = np.flatnonzero(np.isnan(stations) & geolocations.notna().to_numpy())
+            lon, lat = parse_coordinates(geolocations.iloc[dockless])
+            nearest, _ = index.query(lon, lat)
+            matched = ~np.isnan(nearest.astype(np.float64))
+            rows, nearest = dockless[matched], nearest[matched].astype(np.float64)
+
+            values = self.data[col].to_numpy(copy=True)
+            if values.dtype.kind == "f":
+                values[rows] = nearest
+            else:
+                # Cleaned data stores station ids as strings (2.0 -> '2').
+                values = values.astype(object)
+                values[rows] = [str(int(station)) for station in nearest]
+            self.data[col] = values
+            for docked_col, data_col in [("name", name_col), ("address", f"address_{side}")]:
+                filled = self.data[data_col].to_numpy(copy=True).astype(object)
+                filled[rows] = docked[docked_col].reindex(nearest).to_numpy()
+                self.data[data_col] = filled
+            assigned[side] = rows.size
+        return pd.Series(assigned, name="assigned_endpoints")
+
+    def _column(self, col: str) -> pd.Series:
+        """
+        Returns a trips column, rebuilding it from the station table if the data is normalized.
+        """
+        if self._stations is not None and col not in self.data.columns:
+            return station_column(self._stations, self.data, col)
+        return self.data[col]
+
+    @bumps_version
     def delete_nan_rows(self) -> None:
         """
         Deletes rows where all values are NaN.
         """
         self.data.dropna(how="all", inplace=True)
 
+    @bumps_version
     @check_args_types
     def float_to_str(self, col: str) -> None:
         """
@@ -123,6 +429,7 @@ class BiciMad:
         else:
             return content.strip()
 
+    @bumps_version
     @check_args_types
     def format_string_col(self, col: str) -> None:
         """
@@ -151,13 +458,22 @@ class BiciMad:
         Returns:
             None: The method modifies the DataFrame in place.
         """
+        if self._shared_blocks is not None or self._clean_version == self._version:
+            # Shared datasets are cleaned before being published and are read-only, and data
+            # not modified since the last cleaning is already clean.
+            return
         self.delete_nan_rows()
         self.data["trip_minutes"] = self.data["trip_minutes"].fillna(0)
         for col in ["fleet", "idBike", "station_lock", "station_unlock"]:
             self.float_to_str(col)
         for col in ["address_unlock", "address_lock"]:
-            self.format_string_col(col)
+            # Normalized data keeps the addresses in the station table, formatted by the
+            # cleaning that ran before normalizing.
+            if col in self.data.columns:
+                self.format_string_col(col)
+        self._clean_version = self._version
 
+    @memoize_result
     @check_args_types
     def info_most_popular_stations(self, unlock_st: bool = True) -> pd.DataFrame:
         """
@@ -177,11 +493,30 @@ class BiciMad:
             pd.DataFrame: A DataFrame containing information about the most popular station(s),
                         including the station ID, address, and a formatted information string.
         """
+        self._check_full_month("info_most_popular_stations")
         self.clean()
         category = "unlock" if unlock_st else "lock"
-        action_per_st = self.data.groupby([f"station_{category}", f"address_{category}"]).agg(
-            amount=("idBike", "count")
-        )
+        if self._stations is None:
+            action_per_st = self.data.groupby(
+                [f"station_{category}", f"address_{category}"], observed=True
+            ).agg(amount=("idBike", "count"))
+        else:
+            # Count trips per integer station key, then aggregate over the small station table.
+            counts = np.bincount(
+                self.data[f"{category}_key"].to_numpy(),
+                weights=self.data["idBike"].notna().to_numpy(),
+                minlength=self._stations.shape[0],
+            ).astype(np.int64)
+            per_key = pd.DataFrame(
+                {
+                    f"station_{category}": self._stations["station"].to_numpy(),
+                    f"address_{category}": self._stations["address"].to_numpy(),
+                    "amount": counts,
+                }
+            )
+            action_per_st = per_key.groupby(
+                [f"station_{category}", f"address_{category}"], observed=True
+            ).agg(amount=("amount", "sum"))
         max_uses = max(action_per_st["amount"])
         most_popular_st = action_per_st[action_per_st["amount"] == max_uses].reset_index()
         most_popular_st["st_info"] = most_popular_st.apply(
@@ -190,6 +525,7 @@ class BiciMad:
         )
         return most_popular_st
 
+    @memoize_result
     @check_args_types
     def resume(self, unlock_st: bool = False) -> pd.Series:
         """
@@ -216,6 +552,7 @@ class BiciMad:
                 - uses_from_most_popular (list): A list of counts representing the number of uses
                 for the most popular station(s).
         """
+        self._check_full_month("resume")
         self.clean()
         info_most_popular_st = self.info_most_popular_stations(unlock_st)
         resume_data = {
@@ -246,6 +583,7 @@ class BiciMad:
         series = series.apply(lambda x: x / 60)
         return sum(series)
 
+    @memoize_result
     def day_time(self) -> pd.Series:
         """
         Calculates the total trip duration in hours for each day from the DataFrame.
@@ -259,6 +597,7 @@ class BiciMad:
             pd.Series: A Series indexed by date, containing the total trip duration in hours for
                         each day, with the name "total_hours".
         """
+        self._check_full_month("day_time")
         self.clean()
         h_per_day = self.data.groupby(self.data.index)["trip_minutes"].agg(BiciMad.sum_hours)
         h_per_day.index = h_per_day.index.date
@@ -290,6 +629,7 @@ class BiciMad:
         day = date.day_name()
         return days.get(day)
 
+    @memoize_result
     def weekday_time(self) -> pd.Series:
         """
         Calculates the total trip duration in hours for each weekday from the DataFrame.
@@ -304,6 +644,7 @@ class BiciMad:
             pd.Series: A Series indexed by weekday abbreviation, containing the total trip duration
                         in hours for each weekday, with the name "total_hours".
         """
+        self._check_full_month("weekday_time")
         self.clean()
         df_copy = self.data.copy()
         df_copy["weekday"] = df_copy.index.to_series().apply(lambda x: BiciMad.get_weekday(x))
@@ -312,6 +653,7 @@ class BiciMad:
         return w_hours
 
     # C5
+    @memoize_result
     def total_usage_day(self) -> pd.Series:
         """
         Calculates the total number of bike usages per day from the DataFrame.
@@ -324,12 +666,14 @@ class BiciMad:
             pd.Series: A Series indexed by date, containing the total number of bike usages for
             each day, with the name "total_usage".
         """
+        self._check_full_month("total_usage_day")
         self.clean()
         tot_usage = self.data.groupby(self.data.index)["idBike"].count()
         tot_usage.name = "total_usage"
         return tot_usage
 
     # C6
+    @memoize_result
     def usage_by_date_and_unlock_st(self) -> pd.Series:
         """
         Calculates the number of bike usages per day, grouped by the unlock station.
@@ -345,7 +689,457 @@ class BiciMad:
                         and the second level is the unlock station. Each entry represents the total
                         number of bike usages for the corresponding date and unlock station.
         """
+        self._check_full_month("usage_by_date_and_unlock_st")
         self.clean()
-        return self.data.groupby([pd.Grouper(freq="1D"), "station_unlock"]).agg(
+        return self.data.groupby(
+            [pd.Grouper(freq="1D"), self._column("station_unlock")], observed=True
+        ).agg(
             amount=("idBike", "count")
         )
+
+    def _unlock_bins(self) -> tuple:
+        """
+        Bins the unlock timestamps of the trips into integer days (since the epoch), weekdays
+        (0 = Monday) and hours, skipping trips without unlock date.
+        """
+        ns = self.data["unlock_date"].to_numpy(dtype="datetime64[ns]").view(np.int64)
+        valid = ns != np.iinfo(np.int64).min
+        ns = ns[valid]
+        days = ns // (86_400 * 10**9)
+        # 1970-01-01 was a Thursday.
+        weekdays = (days + 3) % 7
+        hours = (ns // (3_600 * 10**9)) % 24
+        return days, weekdays, hours, valid
+
+    @memoize_result
+    @check_args_types
+    def rolling_usage(self, window: int = 7) -> pd.DataFrame:
+        """
+        Calculates the daily number of trips and trip minutes with their rolling sums and means.
+
+        Trips are binned by unlock day with `np.bincount` (days without trips count as 0) and the
+        rolling windows are computed as differences of cumulative sums, instead of resampling.
+
+        Args:
+            window (int): Number of days of the rolling window.
+
+        Returns:
+            pd.DataFrame: Indexed by day, with the columns "trips", "minutes",
+                "trips_rolling_sum", "trips_rolling_mean", "minutes_rolling_sum" and
+                "minutes_rolling_mean". Rolling values are NaN for the first `window - 1` days.
+        """
+        self._check_full_month("rolling_usage")
+        if window < 1:
+            raise ValueError(f"Window has to be a positive number of days, got: {window}")
+        self.clean()
+        days, _, _, valid = self._unlock_bins()
+        first_day = days.min() if days.size else 0
+        n_days = int(days.max() - first_day + 1) if days.size else 0
+        minutes = self.data["trip_minutes"].to_numpy(dtype=np.float64)[valid]
+        usage = pd.DataFrame(
+            {
+                "trips": np.bincount(days - first_day, minlength=n_days),
+                "minutes": np.bincount(days - first_day, weights=minutes, minlength=n_days),
+            },
+            index=pd.DatetimeIndex(
+                ((first_day + np.arange(n_days)) * 86_400 * 10**9).astype("datetime64[ns]"),
+                name="date",
+            ),
+        )
+        for col in ["trips", "minutes"]:
+            cumsum = np.concatenate([[0], np.cumsum(usage[col].to_numpy(dtype=np.float64))])
+            rolling = np.full(n_days, np.nan)
+            rolling[window - 1 :] = cumsum[window:] - cumsum[:-window]
+            usage[f"{col}_rolling_sum"] = rolling
+            usage[f"{col}_rolling_mean"] = rolling / window
+        return usage
+
+    @memoize_result
+    @check_args_types
+    def hour_weekday_matrix(self, values: str = "trips") -> pd.DataFrame:
+        """
+        Builds the weekday by hour of day profile of the trips, by unlock time.
+
+        Args:
+            values (str): "trips" to count trips, "minutes" to sum trip minutes.
+
+        Returns:
+            pd.DataFrame: A 7x24 matrix indexed by weekday abbreviation (Monday first, as
+                returned by `get_weekday`) with one column per hour of the day (0-23).
+        """
+        self._check_full_month("hour_weekday_matrix")
+        if values not in ("trips", "minutes"):
+            raise ValueError(f"Values has to be 'trips' or 'minutes', got: {values}")
+        self.clean()
+        _, weekdays, hours, valid = self._unlock_bins()
+        weights = None
+        if values == "minutes":
+            weights = self.data["trip_minutes"].to_numpy(dtype=np.float64)[valid]
+        matrix = np.bincount(weekdays * 24 + hours, weights=weights, minlength=7 * 24)
+        monday = pd.Timestamp("2024-01-01")
+        return pd.DataFrame(
+            matrix.reshape(7, 24),
+            index=pd.Index(
+                [BiciMad.get_weekday(monday + pd.Timedelta(days=i)) for i in range(7)],
+                name="weekday",
+            ),
+            columns=pd.RangeIndex(24, name="hour"),
+        )
+
+    @check_args_types
+    def peak_hours(self, n: int = 1) -> pd.DataFrame:
+        """
+        Detects the busiest hours of each weekday, by number of trips started.
+
+        Args:
+            n (int): Number of peak hours returned per weekday.
+
+        Returns:
+            pd.DataFrame: One row per weekday and peak hour, with the columns "weekday", "hour"
+                and "trips", busiest hour first within each weekday.
+        """
+        matrix = self.hour_weekday_matrix("trips")
+        top = np.argsort(-matrix.to_numpy(), axis=1, kind="stable")[:, :n]
+        return pd.DataFrame(
+            {
+                "weekday": np.repeat(matrix.index.to_numpy(), top.shape[1]),
+                "hour": top.ravel(),
+                "trips": np.take_along_axis(matrix.to_numpy(), top, axis=1).ravel(),
+            }
+        )
+
+    def _endpoint_coordinates(self, side: str) -> tuple:
+        """
+        Returns the longitude and latitude arrays of one side ("unlock" or "lock") of the trips,
+        taken from the station table if the data is normalized.
+        """
+        if self._stations is not None:
+            keys = self.data[f"{side}_key"].to_numpy()
+            return (
+                self._stations["longitude"].to_numpy()[keys],
+                self._stations["latitude"].to_numpy()[keys],
+            )
+        return parse_coordinates(self.data[f"geolocation_{side}"])
+
+    @memoize_result
+    @check_args_types
+    def trip_speeds(self, max_speed_kmh: int | float = MAX_SPEED_KMH) -> pd.DataFrame:
+        """
+        Computes the great-circle distance between the unlock and lock geolocations of every
+        trip and its average speed, in one vectorized haversine pass.
+
+        Distances are straight lines, so they underestimate the distance actually ridden and
+        round trips have distance 0.
+
+        Args:
+            max_speed_kmh (int | float): Fastest plausible average speed in km/h.
+
+        Returns:
+            pd.DataFrame: Aligned with `data`, with the columns "distance_km", "speed_kmh" and
+                "implausible" (speed above `max_speed_kmh`, or movement in a trip of 0 minutes).
+        """
+        self.clean()
+        lon_unlock, lat_unlock = self._endpoint_coordinates("unlock")
+        lon_lock, lat_lock = self._endpoint_coordinates("lock")
+        minutes = self.data["trip_minutes"].to_numpy(dtype=np.float64)
+        speeds = trip_speeds(lon_unlock, lat_unlock, lon_lock, lat_lock, minutes, max_speed_kmh)
+        return pd.DataFrame(speeds, index=self.data.index)
+
+    @memoize_result
+    @check_args_types
+    def speed_stats(
+        self, by: str = "day", max_speed_kmh: int | float = MAX_SPEED_KMH
+    ) -> pd.DataFrame:
+        """
+        Aggregates the trip distances and speeds computed by `trip_speeds` per day or station.
+
+        Args:
+            by (str): "day", "station_unlock" or "station_lock".
+            max_speed_kmh (int | float): Fastest plausible average speed in km/h.
+
+        Returns:
+            pd.DataFrame: Indexed by day or station, with the number of "trips", the total
+                "distance_km", the "mean_distance_km", the "mean_speed_kmh" (total distance over
+                total time of the plausible trips) and the number of "implausible" trips.
+        """
+        self._check_full_month("speed_stats")
+        if by not in ("day", "station_unlock", "station_lock"):
+            raise ValueError(f"By has to be 'day', 'station_unlock' or 'station_lock', got: {by}")
+        speeds = self.trip_speeds(max_speed_kmh).assign(trip_minutes=self.data["trip_minutes"])
+        if by == "day":
+            return speed_aggregates(speeds, self.data.index, self.data.index.name)
+        return speed_aggregates(speeds, self._column(by), by)
+
+    def _check_full_month(self, method: str) -> None:
+        """
+        Raises if the instance holds a sample, for the methods reporting totals that would
+        silently describe the sample instead of the month.
+        """
+        if self._strata is not None:
+            raise ValueError(
+                f"{method} would report raw sample figures, use sample_estimates or "
+                "daily_estimates on sampled data"
+            )
+
+    @memoize_result
+    @check_args_types
+    def sample_estimates(self, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Scales a sampled month (see `sample_size`) up to estimates of the full month totals.
+
+        Args:
+            confidence (float): Confidence level of the intervals.
+
+        Returns:
+            pd.DataFrame: Indexed by "total_uses" (exact), "total_time" (minutes) and
+                "mean_trip_minutes", with the columns "estimate", "std_error", "ci_low" and
+                "ci_high".
+
+        Raises:
+            ValueError: If the instance does not hold a sample.
+        """
+        if self._strata is None:
+            raise ValueError("Estimates are only available for sampled data (sample_size)")
+        return estimate_totals(
+            self.data, self._column("station_unlock"), self._strata, confidence
+        )
+
+    @memoize_result
+    @check_args_types
+    def daily_estimates(self, confidence: float = 0.95) -> pd.DataFrame:
+        """
+        Scales a sampled month (see `sample_size`) up to estimates of the daily usage, the
+        sampled counterpart of `total_usage_day` and `day_time`.
+
+        Args:
+            confidence (float): Confidence level of the intervals.
+
+        Returns:
+            pd.DataFrame: Indexed by day, with the exact "total_usage" and the estimated total
+                trip hours in "estimate", with "std_error", "ci_low" and "ci_high".
+
+        Raises:
+            ValueError: If the instance does not hold a sample.
+        """
+        if self._strata is None:
+            raise ValueError("Estimates are only available for sampled data (sample_size)")
+        return estimate_totals(
+            self.data, self._column("station_unlock"), self._strata, confidence, by_day=True
+        )
+
+    @memoize_result
+    @check_args_types
+    def report(self, unlock_st: bool = False) -> dict:
+        """
+        Computes the outputs of `resume`, `day_time`, `weekday_time`, `total_usage_day` and
+        `usage_by_date_and_unlock_st` in a single pass over the data.
+
+        The DataFrame is cleaned once, the date, weekday and station keys are factorized once
+        and every aggregate is computed with `np.bincount` over the shared integer codes,
+        instead of running one cleaning and one groupby per method. Results match the
+        individual methods up to floating point summation order.
+
+        Args:
+            unlock_st (bool): Passed to `resume`. If True, considers unlock actions for the most
+                popular station; if False, considers lock actions.
+
+        Returns:
+            dict: Mapping from method name ("resume", "day_time", "weekday_time",
+                "total_usage_day", "usage_by_date_and_unlock_st") to its output.
+        """
+        self._check_full_month("report")
+        self.clean()
+        df = self.data
+        minutes = df["trip_minutes"].to_numpy(dtype=np.float64)
+        has_bike = df["idBike"].notna().to_numpy()
+
+        day_codes, days = pd.factorize(df.index, sort=True)
+        in_day = day_codes >= 0
+        n_days = len(days)
+        uses_per_day = np.bincount(
+            day_codes[in_day], weights=has_bike[in_day], minlength=n_days
+        ).astype(np.int64)
+        minutes_per_day = np.bincount(day_codes[in_day], weights=minutes[in_day], minlength=n_days)
+
+        day_time = pd.Series(minutes_per_day / 60, index=days.date, name="total_hours")
+        total_usage_day = pd.Series(
+            uses_per_day, index=pd.DatetimeIndex(days, name=df.index.name), name="total_usage"
+        )
+
+        day_weekdays = [BiciMad.get_weekday(day) for day in days]
+        weekday_codes, weekdays = pd.factorize(pd.Series(day_weekdays), sort=True)
+        weekday_time = pd.Series(
+            np.bincount(weekday_codes, weights=minutes_per_day, minlength=len(weekdays)) / 60,
+            index=pd.Index(weekdays, name="weekday"),
+            name="total_hours",
+        )
+
+        st_codes, stations = pd.factorize(self._column("station_unlock"), sort=True)
+        n_st = len(stations)
+        valid = in_day & (st_codes >= 0)
+        day_st_counts = np.bincount(
+            day_codes[valid].astype(np.int64) * n_st + st_codes[valid],
+            weights=has_bike[valid],
+            minlength=n_days * n_st,
+        ).astype(np.int64)
+        observed = np.flatnonzero(day_st_counts)
+        usage_by_date_and_unlock_st = pd.DataFrame(
+            {"amount": day_st_counts[observed]},
+            index=pd.MultiIndex.from_arrays(
+                [days[observed // n_st], stations[observed % n_st]],
+                names=[df.index.name, "station_unlock"],
+            ),
+        )
+
+        category = "unlock" if unlock_st else "lock"
+        if not unlock_st:
+            st_codes, stations = pd.factorize(self._column("station_lock"), sort=True)
+        addr_codes, addresses = pd.factorize(self._column(f"address_{category}"), sort=True)
+        valid = (st_codes >= 0) & (addr_codes >= 0)
+        pair_codes, pairs = pd.factorize(
+            st_codes[valid].astype(np.int64) * len(addresses) + addr_codes[valid], sort=True
+        )
+        pair_counts = np.bincount(pair_codes, weights=has_bike[valid]).astype(np.int64)
+        most_popular = np.flatnonzero(pair_counts == pair_counts.max())
+        popular_st = stations[pairs[most_popular] // len(addresses)]
+        popular_addr = addresses[pairs[most_popular] % len(addresses)]
+        resume = pd.Series(
+            {
+                "total_uses": df.shape[0],
+                "total_time": round(float(minutes.sum()), 2),
+                "most_popular_station": [
+                    f"station: {st}, dir: {addr}" for st, addr in zip(popular_st, popular_addr)
+                ],
+                "uses_from_most_popular": pair_counts[most_popular].tolist(),
+            }
+        )
+
+        return {
+            "resume": resume,
+            "day_time": day_time,
+            "weekday_time": weekday_time,
+            "total_usage_day": total_usage_day,
+            "usage_by_date_and_unlock_st": usage_by_date_and_unlock_st,
+        }
+
+    @memoize_result
+    @check_args_types
+    def trip_minutes_digests(self, compression: int = 100) -> dict:
+        """
+        Builds mergeable t-digest sketches of `trip_minutes` for the whole month and for each
+        unlock station, so percentiles can later be queried across months without reloading
+        the data.
+
+        Args:
+            compression (int): Accuracy/size trade-off of the digests (number of centroids is
+                bounded by roughly compression / 2).
+
+        Returns:
+            dict: Mapping with the key "all" for the whole month and "station:<id>" keys for each
+                unlock station, each holding a `TDigest`.
+        """
+        self._check_full_month("trip_minutes_digests")
+        self.clean()
+        digests = {"all": TDigest(compression)}
+        digests["all"].update(self.data["trip_minutes"].to_numpy())
+        per_station = self.data.groupby(self._column("station_unlock"), observed=True)
+        for station, minutes in per_station["trip_minutes"]:
+            digest = TDigest(compression)
+            digest.update(minutes.to_numpy())
+            digests[f"station:{station}"] = digest
+        return digests
+
+    @memoize_result
+    @check_args_types
+    def distinct_bikes_sketches(self, precision: int = 14) -> dict:
+        """
+        Builds mergeable HyperLogLog sketches of the distinct bikes (`idBike`) used in the
+        month, per day and per unlock station.
+
+        The estimated counts have a relative standard error of 1.04 / sqrt(2 ** precision).
+
+        Args:
+            precision (int): Precision of the sketches (4-18).
+
+        Returns:
+            dict: Mapping with the key "all" for the whole month, "day:YYYY-MM-DD" keys for each
+                day and "station:<id>" keys for each unlock station, each holding a
+                `HyperLogLog`.
+        """
+        self._check_full_month("distinct_bikes_sketches")
+        self.clean()
+        bikes = self.data["idBike"].to_numpy()
+        sketches = {"all": HyperLogLog(precision)}
+        sketches["all"].update(bikes)
+        days = self.data.index.strftime("%Y-%m-%d").to_numpy()
+        for day, sketch in HyperLogLog.from_groups(days, bikes, precision).items():
+            sketches[f"day:{day}"] = sketch
+        stations = self._column("station_unlock").to_numpy()
+        for station, sketch in HyperLogLog.from_groups(stations, bikes, precision).items():
+            sketches[f"station:{station}"] = sketch
+        return sketches
+
+    @check_args_types
+    def save_sketches(self, store: SketchStore) -> list:
+        """
+        Computes the month sketches and persists them in a sketch store.
+
+        Args:
+            store (SketchStore): The store where the sketches are saved.
+
+        Returns:
+            list: The paths of the written files.
+
+        Raises:
+            ValueError: If the instance holds a sample instead of the whole month.
+        """
+        self._check_full_month("save_sketches")
+        return [
+            store.save("tdigest", self.month, self.year, self.trip_minutes_digests()),
+            store.save("hyperloglog", self.month, self.year, self.distinct_bikes_sketches()),
+        ]
+
+    @check_args_types
+    def to_database(self, database: TripsDatabase) -> int:
+        """
+        Cleans the month and loads it into a trips database, replacing the month if it was
+        already loaded, so it can be queried with `sql` without loading it again.
+
+        Args:
+            database (TripsDatabase): The database where the trips are loaded.
+
+        Returns:
+            int: The number of trips loaded.
+
+        Raises:
+            ValueError: If the instance holds a sample instead of the whole month.
+        """
+        if self._strata is not None:
+            raise ValueError("Sampled data cannot be loaded into a trips database")
+        self.clean()
+        data = self.data
+        if self._stations is not None:
+            data = join_stations(data, self._stations)
+        return database.ingest(data, self.month, self.year)
+
+    @staticmethod
+    @check_args_types
+    def sql(query: str, database: str | None = None, params: tuple | dict = ()) -> pd.DataFrame:
+        """
+        Runs an ad-hoc SQL query over the `trips` table of a trips database, without loading
+        any month into memory.
+
+        The table holds the columns returned by `get_data` plus "year" and "month", with ids
+        as integers and dates as ISO 8601 text, indexed by (year, month), fecha,
+        station_unlock, station_lock and idBike.
+
+        Args:
+            query (str): The SQL query, with "?" or ":name" placeholders for the parameters.
+            database (str | None): The database file, see `TripsDatabase`.
+            params (tuple | dict): The query parameters.
+
+        Returns:
+            pd.DataFrame: The query result.
+        """
+        with TripsDatabase(database) as trips_db:
+            return trips_db.query(query, params)
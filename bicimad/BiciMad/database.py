@@ -0,0 +1,157 @@
+import os
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from .schemas import TRIPS_V1
+
+DATABASE_ENV = "BICIMAD_DATABASE"
+DATABASE = "bicimad.sqlite3"
+
+# SQLite type of each trips column. Ids are stored as integers and dates as ISO 8601 text, which
+# SQLite's date and time functions understand.
+SQL_TYPES = {"float64": "INTEGER", "object": "TEXT"}
+SQL_COLUMNS = {
+    "year": "INTEGER NOT NULL",
+    "month": "INTEGER NOT NULL",
+    **{col: SQL_TYPES[dtype] for col, dtype in TRIPS_V1["columns"].items()},
+    "trip_minutes": "REAL",
+}
+DATE_FORMATS = {
+    "fecha": "%Y-%m-%d",
+    "unlock_date": "%Y-%m-%d %H:%M:%S",
+    "lock_date": "%Y-%m-%d %H:%M:%S",
+}
+INDEXES = {
+    "trips_period": ["year", "month"],
+    "trips_fecha": ["fecha"],
+    "trips_station_unlock": ["station_unlock"],
+    "trips_station_lock": ["station_lock"],
+    "trips_bike": ["idBike"],
+}
+# Rows inserted per executemany call, bounding the memory of the converted rows.
+INSERT_CHUNKSIZE = 100_000
+
+
+class TripsDatabase:
+    """
+    Embedded SQLite database of trips, one row per trip tagged with the month it was loaded
+    from, indexed by month, date, unlock and lock station and bike.
+
+    Months are ingested from pandas once and queried afterwards with plain SQL, so ad-hoc
+    questions over many months only bring the query result into memory.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        """
+        Args:
+            path (str | Path | None): The database file, created if missing. Defaults to the
+                `BICIMAD_DATABASE` environment variable if set, otherwise to `bicimad.sqlite3`.
+                ":memory:" creates a temporary in-memory database.
+        """
+        self._path = str(path or os.environ.get(DATABASE_ENV) or DATABASE)
+        self._connection = sqlite3.connect(self._path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(f'"{col}" {sql_type}' for col, sql_type in SQL_COLUMNS.items())
+        with self._connection:
+            self._connection.execute(f"CREATE TABLE IF NOT EXISTS trips ({columns})")
+            for name, index_columns in INDEXES.items():
+                quoted = ", ".join(f'"{col}"' for col in index_columns)
+                self._connection.execute(f"CREATE INDEX IF NOT EXISTS {name} ON trips ({quoted})")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        return self._connection
+
+    def __enter__(self) -> "TripsDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def ingest(self, data: pd.DataFrame, month: int, year: int) -> int:
+        """
+        Loads the cleaned trips of a month, replacing the trips previously loaded for it.
+
+        Args:
+            data (pd.DataFrame): Trips with the layout returned by `BiciMad.get_data`, indexed
+                by "fecha". Station ids may be floats or the strings left by `BiciMad.clean`.
+            month (int): The month the trips belong to (1-12).
+            year (int): The year the trips belong to (21-23).
+
+        Returns:
+            int: The number of trips loaded.
+        """
+        rows = to_rows(data, month, year)
+        placeholders = ", ".join("?" * len(SQL_COLUMNS))
+        insert = f"INSERT INTO trips VALUES ({placeholders})"
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM trips WHERE year = ? AND month = ?", (year, month)
+            )
+            for start in range(0, rows.shape[0], INSERT_CHUNKSIZE):
+                chunk = rows.iloc[start : start + INSERT_CHUNKSIZE]
+                self._connection.executemany(insert, chunk.itertuples(index=False, name=None))
+        return rows.shape[0]
+
+    def months(self) -> pd.DataFrame:
+        """
+        Lists the months loaded in the database.
+
+        Returns:
+            pd.DataFrame: One row per month, with the columns "year", "month" and "trips".
+        """
+        return self.query(
+            "SELECT year, month, COUNT(*) AS trips FROM trips GROUP BY year, month "
+            "ORDER BY year, month"
+        )
+
+    def query(self, sql: str, params: tuple | dict = ()) -> pd.DataFrame:
+        """
+        Runs a SQL query over the `trips` table.
+
+        Args:
+            sql (str): The query, with "?" or ":name" placeholders for the parameters.
+            params (tuple | dict): The query parameters.
+
+        Returns:
+            pd.DataFrame: The query result.
+        """
+        return pd.read_sql_query(sql, self._connection, params=params)
+
+
+def to_rows(data: pd.DataFrame, month: int, year: int) -> pd.DataFrame:
+    """
+    Converts trips to the column order and types of the `trips` table.
+
+    Args:
+        data (pd.DataFrame): Trips with the layout returned by `BiciMad.get_data`.
+        month (int): The month the trips belong to.
+        year (int): The year the trips belong to.
+
+    Returns:
+        pd.DataFrame: The rows to insert, with None for missing values.
+    """
+    trips = data.reset_index()
+    rows = {"year": year, "month": month}
+    for col, sql_type in SQL_COLUMNS.items():
+        if col in rows:
+            continue
+        values = trips[col] if col in trips.columns else pd.Series(None, index=trips.index)
+        if col in DATE_FORMATS:
+            values = pd.to_datetime(values).dt.strftime(DATE_FORMATS[col])
+        elif sql_type == "INTEGER":
+            values = pd.to_numeric(values, errors="coerce").astype("Int64")
+        elif sql_type == "REAL":
+            values = values.astype("float64")
+        rows[col] = values.astype(object).where(values.notna(), None)
+    return pd.DataFrame(rows, index=trips.index)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_M = 6_371_000
+
+# Matches the coordinates of EMT geolocations: "{'type': 'Point', 'coordinates': [lon, lat]}".
+COORDINATES_PATTERN = r"\[\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*\]"
+
+
+def parse_coordinates(geolocations: pd.Series) -> tuple:
+    """
+    Parses EMT geolocation strings into longitude and latitude arrays.
+
+    Geolocations repeat heavily (every trip from a station shares one), so only the unique
+    values are parsed and the result is broadcast back with their integer codes.
+
+    Args:
+        geolocations (pd.Series): Geolocation strings.
+
+    Returns:
+        tuple: Two float64 arrays (longitude, latitude), NaN where the value is missing,
+            unparseable or out of the valid coordinate range.
+    """
+    codes, uniques = pd.factorize(geolocations)
+    parsed = pd.Series(uniques, dtype=object).astype(str).str.extract(COORDINATES_PATTERN)
+    unique_coords = parsed.astype(np.float64).to_numpy()
+    out_of_range = (np.abs(unique_coords[:, 0]) > 180) | (np.abs(unique_coords[:, 1]) > 90)
+    unique_coords[out_of_range] = np.nan
+    # Code -1 (missing values) picks the NaN row appended at the end.
+    unique_coords = np.vstack([unique_coords, [np.nan, np.nan]])
+    coords = unique_coords[codes]
+    return coords[:, 0], coords[:, 1]
+
+
+def haversine(lon1, lat1, lon2, lat2) -> np.ndarray:
+    """
+    Computes the great-circle distance between pairs of points, element-wise.
+
+    Args:
+        lon1, lat1: Longitudes and latitudes of the first points, in degrees.
+        lon2, lat2: Longitudes and latitudes of the second points, in degrees.
+
+    Returns:
+        np.ndarray: Distances in meters, NaN where any coordinate is NaN.
+    """
+    lon1, lat1, lon2, lat2 = (
+        np.radians(np.asarray(values, dtype=np.float64)) for values in (lon1, lat1, lon2, lat2)
+    )
+    a = np.sin((lat2 - lat1) / 2) ** 2
+    a += np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
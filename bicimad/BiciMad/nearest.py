@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+
+from .geo import EARTH_RADIUS_M, parse_coordinates
+
+# Station candidates compared at once by `StationIndex.query`, about 16 bytes each (position and
+# squared distance) plus temporaries of the same size.
+MAX_CANDIDATES = 4_000_000
+
+
+class StationIndex:
+    """
+    Spatial index answering batched nearest-station queries within a distance threshold.
+
+    Stations are projected to meters (equirectangular projection, accurate at city scale) and
+    bucketed into a uniform grid whose cells are as wide as the threshold, so the nearest
+    station within the threshold is always in the 3x3 cells around a point. The grid is sparse:
+    only the cells holding stations are stored, sorted by cell id, so its size does not depend
+    on the extent of the stations (an outlier at a bad coordinate) or on the threshold. A query
+    finds the candidate cells of every point at once with `np.searchsorted`, in chunks sized so
+    the candidates compared at once stay under `MAX_CANDIDATES`, however crowded the cells are.
+    """
+
+    def __init__(self, station_ids, longitude, latitude, max_distance: int | float = 100) -> None:
+        longitude = np.asarray(longitude, dtype=np.float64)
+        latitude = np.asarray(latitude, dtype=np.float64)
+        known = ~(np.isnan(longitude) | np.isnan(latitude))
+        self._station_ids = np.asarray(station_ids)[known]
+        self._max_distance = float(max_distance)
+        self._lat0 = float(np.mean(latitude[known])) if known.any() else 0.0
+        self._x, self._y = self._project(longitude[known], latitude[known])
+
+        self._origin = (self._x.min(), self._y.min()) if self._x.size else (0.0, 0.0)
+        cell = self._cell_ids(*self._cells(self._x, self._y))
+        order = np.argsort(cell, kind="stable")
+        self._cell_keys, starts, counts = np.unique(
+            cell[order], return_index=True, return_counts=True
+        )
+        rank = np.arange(cell.size) - np.repeat(starts, counts)
+        # One row of station positions per non-empty cell, plus a last row of -1 for the cells
+        # without stations.
+        self._table = np.full(
+            (self._cell_keys.size + 1, max(int(counts.max(initial=0)), 1)), -1
+        )
+        self._table[np.repeat(np.arange(counts.size), counts), rank] = order
+
+    @property
+    def max_distance(self) -> float:
+        return self._max_distance
+
+    def _project(self, longitude: np.ndarray, latitude: np.ndarray) -> tuple:
+        x = EARTH_RADIUS_M * np.radians(longitude) * np.cos(np.radians(self._lat0))
+        y = EARTH_RADIUS_M * np.radians(latitude)
+        return x, y
+
+    def _cells(self, x: np.ndarray, y: np.ndarray) -> tuple:
+        size = max(self._max_distance, 1.0)
+        ix = np.floor((x - self._origin[0]) / size).astype(np.int64)
+        iy = np.floor((y - self._origin[1]) / size).astype(np.int64)
+        return ix, iy
+
+    @staticmethod
+    def _cell_ids(ix: np.ndarray, iy: np.ndarray) -> np.ndarray:
+        # Cells are at most a few tens of millions apart on Earth, far below 2 ** 31.
+        return ix * 2**32 + iy
+
+    def query(self, longitude, latitude, chunk_size: int | None = None) -> tuple:
+        """
+        Finds the nearest station within the distance threshold of every point.
+
+        Args:
+            longitude (array-like): Longitudes of the points.
+            latitude (array-like): Latitudes of the points.
+            chunk_size (int | None): Number of points processed at once. Defaults to as many as
+                keep the candidates of a chunk (9 cells of up to the most stations in one cell
+                per point) under `MAX_CANDIDATES`.
+
+        Returns:
+            tuple: The nearest station id of every point (NaN/None where no station is within
+                the threshold or the point has no coordinates) and the distance in meters
+                (NaN where there is no match).
+        """
+        longitude = np.asarray(longitude, dtype=np.float64)
+        latitude = np.asarray(latitude, dtype=np.float64)
+        nearest = np.full(longitude.size, -1, dtype=np.int64)
+        distance = np.full(longitude.size, np.nan)
+        dx, dy = np.array([(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]).T
+        if chunk_size is None:
+            chunk_size = max(MAX_CANDIDATES // (dx.size * self._table.shape[1]), 1)
+
+        valid = np.flatnonzero(~(np.isnan(longitude) | np.isnan(latitude)))
+        for start in range(0, valid.size if self._x.size else 0, chunk_size):
+            points = valid[start : start + chunk_size]
+            x, y = self._project(longitude[points], latitude[points])
+            ix, iy = self._cells(x, y)
+            cells = self._cell_ids(ix[:, None] + dx, iy[:, None] + dy)
+            rows = np.searchsorted(self._cell_keys, cells)
+            found = rows < self._cell_keys.size
+            found[found] = self._cell_keys[rows[found]] == cells[found]
+            rows[~found] = self._cell_keys.size
+            candidates = self._table[rows].reshape(points.size, dx.size * self._table.shape[1])
+            dist2 = (self._x[candidates] - x[:, None]) ** 2
+            dist2 += (self._y[candidates] - y[:, None]) ** 2
+            dist2[candidates < 0] = np.inf
+            best = np.argmin(dist2, axis=1)
+            best_dist = np.sqrt(dist2[np.arange(points.size), best])
+            matched = best_dist <= self._max_distance
+            nearest[points[matched]] = candidates[np.arange(points.size), best][matched]
+            distance[points[matched]] = best_dist[matched]
+
+        ids = pd.Series(self._station_ids).reindex(nearest).to_numpy()
+        return ids, distance
+
+
+def station_coordinates(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Locates every known station as the median coordinates of the trips docked at it, over both
+    unlock and lock sides.
+
+    Args:
+        data (pd.DataFrame): Trips with the layout returned by `BiciMad.get_data`, before or
+            after `clean`.
+
+    Returns:
+        pd.DataFrame: Indexed by numeric station id, with "longitude" and "latitude" columns.
+    """
+    sides = []
+    for side in ["unlock", "lock"]:
+        stations = pd.to_numeric(data[f"station_{side}"], errors="coerce").to_numpy()
+        docked = ~np.isnan(stations)
+        lon, lat = parse_coordinates(data[f"geolocation_{side}"][docked])
+        sides.append(pd.DataFrame({"station": stations[docked], "longitude": lon, "latitude": lat}))
+    return pd.concat(sides).groupby("station").median().dropna()
@@ -0,0 +1,171 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# Candidates kept per stratum of the days already read, relative to its current proportional
+# share, as a margin for trips of those days appearing again later in unordered files.
+OVERSAMPLING = 1.5
+DAY_NS = 86_400 * 10**9
+# Stratum ids are day * STRATA_PER_DAY + station + 1 (see `stratum_ids`).
+STRATA_PER_DAY = 1_000_000
+
+
+def stratum_ids(fecha: pd.Index, stations: pd.Series) -> np.ndarray:
+    """
+    Combines the day and the unlock station of every trip into one integer stratum id.
+
+    Args:
+        fecha (pd.Index): The dates of the trips.
+        stations (pd.Series): The unlock stations, as floats or as the strings left by `clean`.
+            Trips without station share one stratum per day, trips without date one stratum
+            per station.
+
+    Returns:
+        np.ndarray: The int64 stratum id of every trip.
+    """
+    ns = pd.DatetimeIndex(fecha).to_numpy(dtype="datetime64[ns]").view(np.int64)
+    # Trips without date (NaT) share the strata of day -1.
+    days = np.where(ns == np.iinfo(np.int64).min, -1, ns // DAY_NS)
+    station = pd.to_numeric(pd.Series(stations), errors="coerce").fillna(-1).to_numpy()
+    return days * STRATA_PER_DAY + station.astype(np.int64) + 1
+
+
+def stratified_sample(chunks, sample_size: int, seed: int = 0) -> tuple:
+    """
+    Draws a reproducible sample of trips stratified by day and unlock station while streaming
+    the data chunk by chunk.
+
+    Every trip gets a random key and each stratum keeps the trips with the smallest keys
+    (bottom-k sampling, equivalent to a reservoir per stratum). The final allocation is
+    proportional to the stratum sizes, with at least one trip per stratum so estimates have no
+    uncovered strata; the sample can therefore be slightly larger than `sample_size`.
+
+    While streaming, the strata of the days still being read (from the first day of the current
+    chunk on, plus the trips without date) keep all their trips. The strata of earlier days are
+    cut down to their share of the trips seen so far, which can only shrink as more trips come
+    in, so no trip of the final sample is ever dropped. With the trips ordered by day, as EMT
+    publishes them, the sample does not depend on the chunk size and memory is bounded by the
+    sample size, one day of trips and one chunk.
+
+    Args:
+        chunks (iterable): DataFrames with the layout returned by `BiciMad.get_data`.
+        sample_size (int): Target number of sampled trips.
+        seed (int): Seed of the random keys.
+
+    Returns:
+        tuple: The sampled trips (pd.DataFrame) and the strata (pd.DataFrame indexed by stratum
+            id, with the exact "population" of each stratum and the number "sampled").
+    """
+    if sample_size < 1:
+        raise ValueError(f"Sample size has to be a positive number of trips, got: {sample_size}")
+    rng = np.random.default_rng(seed)
+    kept, population = None, pd.Series(dtype=np.int64)
+    for chunk in chunks:
+        chunk = chunk.dropna(how="all")
+        if chunk.empty:
+            continue
+        chunk = chunk.assign(
+            _stratum=stratum_ids(chunk.index, chunk["station_unlock"]),
+            _key=rng.random(chunk.shape[0]),
+        )
+        population = population.add(chunk.groupby("_stratum").size(), fill_value=0)
+        caps = np.ceil(OVERSAMPLING * sample_size * population / population.sum()) + 1
+        days = population.index.to_numpy() // STRATA_PER_DAY
+        chunk_days = chunk["_stratum"].to_numpy() // STRATA_PER_DAY
+        first_day = chunk_days[chunk_days >= 0].min(initial=np.iinfo(np.int64).max)
+        caps[(days >= first_day) | (days < 0)] = np.inf
+        candidates = chunk if kept is None else pd.concat([kept, chunk])
+        kept = _bottom_k(candidates, caps)
+
+    if kept is None:
+        raise ValueError("No trips found to sample")
+    population = population.astype(np.int64)
+    allocation = np.maximum(np.round(sample_size * population / population.sum()), 1)
+    sample = _bottom_k(kept, allocation)
+    strata = pd.DataFrame(
+        {
+            "population": population,
+            "sampled": sample.groupby("_stratum").size().reindex(population.index, fill_value=0),
+        }
+    )
+    strata.index.name = "stratum"
+    return sample.drop(columns=["_stratum", "_key"]), strata
+
+
+def _bottom_k(candidates: pd.DataFrame, caps: pd.Series) -> pd.DataFrame:
+    """
+    Keeps, for every stratum, the `caps[stratum]` candidates with the smallest random keys.
+    """
+    candidates = candidates.sort_values("_key", kind="stable")
+    rank = candidates.groupby("_stratum").cumcount().to_numpy()
+    keep = rank < caps.reindex(candidates["_stratum"]).to_numpy()
+    return candidates[keep].sort_index(kind="stable")
+
+
+def estimate_totals(
+    data: pd.DataFrame,
+    stations: pd.Series,
+    strata: pd.DataFrame,
+    confidence: float = 0.95,
+    by_day: bool = False,
+) -> pd.DataFrame:
+    """
+    Scales a stratified sample of trips up to estimates of the full month with confidence
+    intervals (normal approximation of the stratified estimator).
+
+    The number of trips is known exactly from the strata populations. Trip time totals are
+    estimated as the sum over strata of population times sample mean, with variance
+    sum(N_h^2 * (1 - n_h / N_h) * s_h^2 / n_h). Strata with a single sampled trip use the pooled
+    within-stratum variance.
+
+    Args:
+        data (pd.DataFrame): The sampled trips.
+        stations (pd.Series): The unlock stations of the sampled trips, given apart since
+            normalized data keeps them in the station table.
+        strata (pd.DataFrame): The strata returned by `stratified_sample`.
+        confidence (float): Confidence level of the intervals.
+        by_day (bool): If True, estimates per day instead of for the whole month.
+
+    Returns:
+        pd.DataFrame: One row per estimate ("total_uses", "total_time" in minutes and
+            "mean_trip_minutes") with the columns "estimate", "std_error", "ci_low" and
+            "ci_high". With `by_day`, one row per day with the exact "total_usage" and the same
+            columns for the estimated total trip hours.
+    """
+    minutes = data["trip_minutes"].fillna(0)
+    per_stratum = minutes.groupby(stratum_ids(data.index, stations)).agg(["count", "mean", "var"])
+    per_stratum = per_stratum.reindex(strata.index)
+    n_h = per_stratum["count"].fillna(0).to_numpy()
+    pop = strata["population"].to_numpy(dtype=np.float64)
+    pooled = np.nansum((n_h - 1) * per_stratum["var"]) / max(np.sum(n_h - 1, where=n_h > 1), 1)
+    var_h = np.where(n_h > 1, per_stratum["var"].fillna(0), pooled)
+    totals = pop * per_stratum["mean"].fillna(0).to_numpy()
+    variances = np.where(n_h > 0, pop**2 * (1 - n_h / pop) * var_h / np.maximum(n_h, 1), 0.0)
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    if by_day:
+        days = pd.to_datetime(strata.index.to_numpy() // STRATA_PER_DAY * DAY_NS)
+        per_day = pd.DataFrame(
+            {"uses": pop, "total": totals / 60, "var": variances / 3600}, index=days
+        ).groupby(level=0).sum()
+        estimates = pd.DataFrame(
+            {
+                "total_usage": per_day["uses"].astype(np.int64),
+                "estimate": per_day["total"],
+                "std_error": np.sqrt(per_day["var"]),
+            },
+            index=pd.DatetimeIndex(per_day.index, name="date"),
+        )
+    else:
+        total_uses, total_time, std_error = pop.sum(), totals.sum(), np.sqrt(variances.sum())
+        estimates = pd.DataFrame(
+            {
+                "estimate": [total_uses, total_time, total_time / total_uses],
+                "std_error": [0.0, std_error, std_error / total_uses],
+            },
+            index=["total_uses", "total_time", "mean_trip_minutes"],
+        )
+    estimates["ci_low"] = estimates["estimate"] - z * estimates["std_error"]
+    estimates["ci_high"] = estimates["estimate"] + z * estimates["std_error"]
+    return estimates
@@ -0,0 +1,169 @@
+from typing import TextIO
+
+import pandas as pd
+
+from UrlEMT.constants import MONTH_SCHEMAS
+
+# Layout shared by every trips file published since June 2021.
+TRIPS_V1 = {
+    "sep": ";",
+    "index": "fecha",
+    "columns": {
+        "fecha": "object",
+        "idBike": "float64",
+        "fleet": "float64",
+        "trip_minutes": "float64",
+        "geolocation_unlock": "object",
+        "address_unlock": "object",
+        "unlock_date": "object",
+        "locktype": "object",
+        "unlocktype": "object",
+        "geolocation_lock": "object",
+        "address_lock": "object",
+        "lock_date": "object",
+        "station_unlock": "float64",
+        "unlock_station_name": "object",
+        "station_lock": "float64",
+        "lock_station_name": "object",
+    },
+    # "ISO8601" uses pandas' vectorized ISO parser, which accepts both the "T" and the space
+    # separator EMT has used between date and time.
+    "dates": {
+        "fecha": "%Y-%m-%d",
+        "unlock_date": "ISO8601",
+        "lock_date": "ISO8601",
+    },
+}
+
+SCHEMAS = {
+    "trips_v1": TRIPS_V1,
+}
+
+# Column added in "coerce" mode, True in the rows with a numeric value that could not be parsed.
+INVALID_NUMBERS = "invalid_numbers"
+
+
+def get_schema(month: int, year: int) -> dict:
+    """
+    Retrieves the schema declared for the trips file of a given month and year.
+
+    Args:
+        month (int): The month of the file (1-12).
+        year (int): The year of the file (21-23).
+
+    Returns:
+        dict: The schema, with the CSV separator, index column, column dtypes and exact
+            datetime formats.
+
+    Raises:
+        ValueError: If the month is unknown to the registry or its file is known to be malformed.
+    """
+    key = f"{year}_{month:02}"
+    if key not in MONTH_SCHEMAS:
+        raise ValueError(f"No schema registered for month {month} year {year}")
+    if MONTH_SCHEMAS[key] is None:
+        raise ValueError(f"The file for month {month} year {year} is malformed and not supported")
+    return SCHEMAS[MONTH_SCHEMAS[key]]
+
+
+def check_header(csv_file: TextIO, schema: dict) -> list:
+    """
+    Reads the header of a CSV file and checks it declares every column of the schema,
+    leaving the file positioned at its beginning.
+
+    Args:
+        csv_file (TextIO): The CSV file.
+        schema (dict): The expected schema.
+
+    Returns:
+        list: The column names found in the header.
+
+    Raises:
+        ValueError: If any column of the schema is missing from the header.
+    """
+    csv_file.seek(0)
+    header = csv_file.readline().lstrip("﻿").rstrip("\r\n").split(schema["sep"])
+    csv_file.seek(0)
+    missing = [col for col in schema["columns"] if col not in header]
+    if missing:
+        raise ValueError(f"Schema drift detected, missing columns {missing} in header {header}")
+    return header
+
+
+def parse_csv(csv_file: TextIO, schema: dict, errors: str = "raise") -> pd.DataFrame:
+    """
+    Parses a trips CSV file with the dtypes and datetime formats declared by a schema.
+
+    Args:
+        csv_file (TextIO): The CSV file.
+        schema (dict): The schema of the file.
+        errors (str): "raise" to fail on values not matching their dtype or datetime format,
+            "coerce" to turn them into NaN/NaT and flag the rows with unparseable numbers in an
+            extra `INVALID_NUMBERS` column (e.g. to quarantine those rows afterwards).
+
+    Returns:
+        pd.DataFrame: The parsed trips, indexed by the schema index column.
+
+    Raises:
+        ValueError: If the header does not match the schema or a value does not match its
+            declared dtype or datetime format.
+    """
+    check_header(csv_file, schema)
+    df = pd.read_csv(csv_file, **_read_csv_options(schema, errors))
+    return _convert(df, schema, errors)
+
+
+def read_chunks(csv_file: TextIO, schema: dict, chunksize: int, errors: str = "raise"):
+    """
+    Parses a trips CSV file like `parse_csv`, yielding it in chunks instead of all at once.
+
+    Args:
+        csv_file (TextIO): The CSV file.
+        schema (dict): The schema of the file.
+        chunksize (int): Number of rows per chunk.
+        errors (str): "raise" or "coerce", as in `parse_csv`.
+
+    Yields:
+        pd.DataFrame: The parsed chunks, indexed by the schema index column.
+
+    Raises:
+        ValueError: If the header does not match the schema or a value does not match its
+            declared dtype or datetime format.
+    """
+    check_header(csv_file, schema)
+    options = _read_csv_options(schema, errors)
+    with pd.read_csv(csv_file, chunksize=chunksize, **options) as reader:
+        for chunk in reader:
+            yield _convert(chunk, schema, errors)
+
+
+def _numeric_columns(schema: dict) -> dict:
+    return {
+        col: dtype
+        for col, dtype in schema["columns"].items()
+        if col not in schema["dates"] and dtype != "object"
+    }
+
+
+def _read_csv_options(schema: dict, errors: str) -> dict:
+    columns = schema["columns"]
+    dtypes = {col: dtype for col, dtype in columns.items() if col not in schema["dates"]}
+    if errors == "coerce":
+        # Numeric columns are read as strings and converted afterwards, so a single bad value
+        # does not abort the whole file.
+        dtypes.update({col: "object" for col in _numeric_columns(schema)})
+    return {"sep": schema["sep"], "usecols": list(columns), "dtype": dtypes}
+
+
+def _convert(df: pd.DataFrame, schema: dict, errors: str) -> pd.DataFrame:
+    if errors == "coerce":
+        invalid = pd.Series(False, index=df.index)
+        for col, dtype in _numeric_columns(schema).items():
+            values = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+            invalid |= df[col].notna() & values.isna()
+            df[col] = values
+        df[INVALID_NUMBERS] = invalid
+    for col, date_format in schema["dates"].items():
+        dates = pd.to_datetime(df[col], format=date_format, errors=errors)
+        df[col] = dates.astype("datetime64[ns]")
+    return df.set_index(schema["index"])
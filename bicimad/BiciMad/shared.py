@@ -0,0 +1,192 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+INDEX_KEY = "__index__"
+# Separator of the categories packed into a single UTF-8 block, absent from EMT strings.
+CATEGORY_SEPARATOR = "\x00"
+
+
+def _open_block(name: str) -> SharedMemory:
+    """
+    Attaches to an existing shared memory block without letting this process' resource
+    tracker unlink it on exit (only the publishing process owns the block).
+    """
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 has no `track` argument.
+        return SharedMemory(name=name)
+
+
+class SharedDataset:
+    """
+    A month of trips published in `multiprocessing.shared_memory` blocks, one per column.
+
+    Numeric and datetime columns are copied as is, string columns are stored as categorical
+    codes plus a block with their categories packed as UTF-8, so `spec` stays small whatever
+    the cardinality. Worker processes rebuild the DataFrame from `spec` with `attach`, getting
+    read-only views over the shared blocks instead of private copies.
+
+    The category strings are the exception: pandas needs Python string objects, so every
+    worker decodes its own copy of them. That costs memory proportional to the distinct values
+    of each string column, not to the number of trips, but it is significant for per-trip
+    strings such as the geolocations and addresses of dockless trips.
+    """
+
+    def __init__(self, spec: dict, blocks: list) -> None:
+        self._spec = spec
+        self._blocks = blocks
+
+    @property
+    def spec(self) -> dict:
+        return self._spec
+
+    @classmethod
+    def publish(
+        cls, data: pd.DataFrame, month: int, year: int, stations: pd.DataFrame | None = None
+    ) -> "SharedDataset":
+        """
+        Copies a DataFrame into shared memory blocks.
+
+        Args:
+            data (pd.DataFrame): The trips to publish.
+            month (int): The month the data belongs to.
+            year (int): The year the data belongs to.
+            stations (pd.DataFrame | None): The station table of normalized trips, published
+                along with them.
+
+        Returns:
+            SharedDataset: The published dataset. The caller owns the blocks and must `unlink`
+                them (or use it as a context manager) once the workers are done.
+        """
+        blocks = []
+        spec = {"month": month, "year": year, "columns": _publish_frame(data, blocks)}
+        spec["stations"] = None if stations is None else _publish_frame(stations, blocks)
+        return cls(spec, blocks)
+
+    def close(self) -> None:
+        """
+        Closes this process' access to the shared blocks.
+        """
+        for block in self._blocks:
+            block.close()
+
+    def unlink(self) -> None:
+        """
+        Closes and destroys the shared blocks. Attached workers must be done with them.
+        """
+        self.close()
+        for block in self._blocks:
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.unlink()
+
+
+def _publish_frame(data: pd.DataFrame, blocks: list) -> list:
+    """
+    Copies the index and columns of a DataFrame into new shared memory blocks, appended to
+    `blocks`, and returns their column specs.
+    """
+    arrays = {INDEX_KEY: (data.index.name, data.index.to_numpy(), None)}
+    for col in data.columns:
+        series = data[col]
+        if series.dtype.kind in "biufcmM":
+            arrays[col] = (col, series.to_numpy(), None)
+        else:
+            categorical = pd.Categorical(series)
+            arrays[col] = (col, categorical.codes, categorical.categories)
+
+    columns = []
+    for key, (name, array, categories) in arrays.items():
+        block = SharedMemory(create=True, size=max(array.nbytes, 1))
+        blocks.append(block)
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+        column = {
+            "key": key,
+            "name": name,
+            "block": block.name,
+            "dtype": array.dtype.str,
+            "shape": array.shape,
+            "categories": categories,
+            "categories_block": None,
+        }
+        if categories is not None and _packable(categories):
+            packed = CATEGORY_SEPARATOR.join(categories).encode("utf-8")
+            categories_block = SharedMemory(create=True, size=max(len(packed), 1))
+            blocks.append(categories_block)
+            categories_block.buf[: len(packed)] = packed
+            column["categories"] = None
+            column["categories_block"] = (categories_block.name, len(packed), len(categories))
+        columns.append(column)
+    return columns
+
+
+def _packable(categories: pd.Index) -> bool:
+    """
+    Checks whether categories can be packed into a UTF-8 block, otherwise they are pickled.
+    """
+    return categories.inferred_type == "string" and not any(
+        CATEGORY_SEPARATOR in value for value in categories
+    )
+
+
+def _unpack_categories(categories_block: tuple, blocks: list) -> list:
+    """
+    Decodes the categories packed by `_publish_frame`, appending the block to `blocks`.
+    """
+    name, size, n_categories = categories_block
+    block = _open_block(name)
+    blocks.append(block)
+    if n_categories == 0:
+        return []
+    return bytes(block.buf[:size]).decode("utf-8").split(CATEGORY_SEPARATOR)
+
+
+def _attach_frame(columns_spec: list, blocks: list) -> pd.DataFrame:
+    """
+    Rebuilds a DataFrame published by `_publish_frame` over its shared blocks, appending the
+    attached blocks to `blocks`.
+    """
+    columns, index = {}, None
+    for col in columns_spec:
+        block = _open_block(col["block"])
+        blocks.append(block)
+        array = np.ndarray(col["shape"], dtype=np.dtype(col["dtype"]), buffer=block.buf)
+        array.flags.writeable = False
+        categories = col["categories"]
+        if col["categories_block"] is not None:
+            categories = _unpack_categories(col["categories_block"], blocks)
+        if categories is not None:
+            array = pd.Categorical.from_codes(array, categories=categories, validate=False)
+        if col["key"] == INDEX_KEY:
+            index = pd.Index(array, name=col["name"], copy=False)
+        else:
+            columns[col["name"]] = array
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def attach(spec: dict) -> tuple:
+    """
+    Rebuilds a published DataFrame as zero-copy read-only views over its shared blocks.
+
+    Args:
+        spec (dict): The `spec` of a `SharedDataset`.
+
+    Returns:
+        tuple: The DataFrame, the station table published with it (None if the trips are not
+            normalized) and the list of attached `SharedMemory` blocks, which must be kept
+            alive (and closed afterwards) for as long as the DataFrames are used.
+    """
+    blocks = []
+    data = _attach_frame(spec["columns"], blocks)
+    stations = None
+    if spec.get("stations") is not None:
+        stations = _attach_frame(spec["stations"], blocks)
+    return data, stations, blocks
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from .geo import haversine
+
+# Fastest average speed (km/h) considered plausible. The e-bike assistance cuts off at 25 km/h,
+# so sustained averages well above it point to wrong geolocations or durations.
+MAX_SPEED_KMH = 40
+
+
+def trip_speeds(
+    lon_unlock,
+    lat_unlock,
+    lon_lock,
+    lat_lock,
+    trip_minutes,
+    max_speed_kmh: int | float = MAX_SPEED_KMH,
+) -> dict:
+    """
+    Computes the straight-line distance and average speed of every trip in one vectorized pass.
+
+    Args:
+        lon_unlock, lat_unlock: Coordinates where the trips started, in degrees.
+        lon_lock, lat_lock: Coordinates where the trips ended, in degrees.
+        trip_minutes: Durations of the trips in minutes.
+        max_speed_kmh (int | float): Fastest plausible average speed.
+
+    Returns:
+        dict: Arrays "distance_km" (NaN without both geolocations), "speed_kmh" (NaN without
+            distance or without a positive duration) and "implausible" (True where the speed is
+            above `max_speed_kmh`, or where the bike moved in a trip without duration).
+    """
+    distance = haversine(lon_unlock, lat_unlock, lon_lock, lat_lock) / 1000
+    hours = np.asarray(trip_minutes, dtype=np.float64) / 60
+    timed = hours > 0
+    speed = np.full(distance.shape, np.nan)
+    np.divide(distance, hours, out=speed, where=timed)
+    implausible = (speed > max_speed_kmh) | (~timed & (distance > 0))
+    return {"distance_km": distance, "speed_kmh": speed, "implausible": implausible}
+
+
+def speed_aggregates(speeds: pd.DataFrame, keys, name: str) -> pd.DataFrame:
+    """
+    Aggregates per-trip distances and speeds by a grouping key, with `np.bincount` over the
+    factorized keys.
+
+    The mean speed of a group is its total distance over its total time, over the trips with a
+    plausible speed, so long trips weigh more than short ones.
+
+    Args:
+        speeds (pd.DataFrame): The output of `trip_speeds` plus a "trip_minutes" column.
+        keys: The grouping key of every trip (e.g. day or station), NaN keys are skipped.
+        name (str): Name of the resulting index.
+
+    Returns:
+        pd.DataFrame: Indexed by key, with the columns "trips", "distance_km",
+            "mean_distance_km", "mean_speed_kmh" and "implausible".
+    """
+    codes, uniques = pd.factorize(keys, sort=True)
+    n_keys = len(uniques)
+    valid = codes >= 0
+    codes = codes[valid]
+    distance = speeds["distance_km"].to_numpy()[valid]
+    hours = speeds["trip_minutes"].to_numpy(dtype=np.float64)[valid] / 60
+    implausible = speeds["implausible"].to_numpy()[valid]
+    has_distance = ~np.isnan(distance)
+    plausible = ~np.isnan(speeds["speed_kmh"].to_numpy()[valid]) & ~implausible
+
+    def total(weights, mask):
+        return np.bincount(codes[mask], weights=weights[mask], minlength=n_keys)
+
+    distance_sum = total(distance, has_distance)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_distance = distance_sum / np.bincount(codes[has_distance], minlength=n_keys)
+        mean_speed = total(distance, plausible) / total(hours, plausible)
+    return pd.DataFrame(
+        {
+            "trips": np.bincount(codes, minlength=n_keys),
+            "distance_km": distance_sum,
+            "mean_distance_km": mean_distance,
+            "mean_speed_kmh": mean_speed,
+            "implausible": np.bincount(codes, weights=implausible, minlength=n_keys).astype(
+                np.int64
+            ),
+        },
+        index=pd.Index(uniques, name=name),
+    )
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from .geo import parse_coordinates
+
+# Station attributes stored in the dimension table, with the trips column holding them per side.
+STATION_FIELDS = {
+    "station": "station_{side}",
+    "station_name": "{side}_station_name",
+    "address": "address_{side}",
+    "geolocation": "geolocation_{side}",
+}
+SIDES = ["unlock", "lock"]
+
+
+def normalize_stations(data: pd.DataFrame) -> tuple:
+    """
+    Splits trips into a station dimension table and a trips table holding integer station keys.
+
+    A station entry is a distinct (station, station_name, address, geolocation) combination, so
+    both sides of every trip are represented exactly. Each attribute is factorized once over
+    both sides and the codes are combined into a single key.
+
+    Args:
+        data (pd.DataFrame): Trips with the layout returned by `BiciMad.get_data`.
+
+    Returns:
+        tuple: The station table (pd.DataFrame indexed by "station_key", with the station
+            attributes plus parsed "longitude" and "latitude") and the trips table
+            (pd.DataFrame without the station attribute columns, with int32 "unlock_key" and
+            "lock_key" columns).
+    """
+    n_rows = data.shape[0]
+    values, keys = {}, np.zeros(2 * n_rows, dtype=np.int64)
+    for field, col in STATION_FIELDS.items():
+        both_sides = pd.concat([data[col.format(side=side)] for side in SIDES], ignore_index=True)
+        codes, uniques = pd.factorize(both_sides, use_na_sentinel=False)
+        values[field] = (codes, uniques)
+        keys = pd.factorize(keys * len(uniques) + codes)[0]
+
+    n_keys = keys.max() + 1 if keys.size else 0
+    first = np.empty(n_keys, dtype=np.int64)
+    first[keys[::-1]] = np.arange(keys.size)[::-1]
+    stations = pd.DataFrame(
+        {field: uniques.take(codes[first]) for field, (codes, uniques) in values.items()},
+        index=pd.RangeIndex(n_keys, name="station_key"),
+    )
+    stations["longitude"], stations["latitude"] = parse_coordinates(stations["geolocation"])
+
+    columns = [col.format(side=side) for side in SIDES for col in STATION_FIELDS.values()]
+    trips = data.drop(columns=columns)
+    trips["unlock_key"] = keys[:n_rows].astype(np.int32)
+    trips["lock_key"] = keys[n_rows:].astype(np.int32)
+    return stations, trips
+
+
+def station_column(stations: pd.DataFrame, trips: pd.DataFrame, col: str) -> pd.Series:
+    """
+    Rebuilds one of the original station attribute columns of the trips from its keys.
+
+    Args:
+        stations (pd.DataFrame): The station table.
+        trips (pd.DataFrame): The trips table with integer station keys.
+        col (str): The original column name (e.g. "station_unlock" or "address_lock").
+
+    Returns:
+        pd.Series: The column, aligned with the trips index.
+
+    Raises:
+        KeyError: If `col` is not a station attribute column.
+    """
+    for side in SIDES:
+        for field, template in STATION_FIELDS.items():
+            if template.format(side=side) == col:
+                values = stations[field].to_numpy()[trips[f"{side}_key"].to_numpy()]
+                return pd.Series(values, index=trips.index, name=col)
+    raise KeyError(f"'{col}' is not a station column")
+
+
+def join_stations(trips: pd.DataFrame, stations: pd.DataFrame) -> pd.DataFrame:
+    """
+    Joins the station attributes back into the trips, restoring the original layout.
+
+    Args:
+        trips (pd.DataFrame): The trips table with integer station keys.
+        stations (pd.DataFrame): The station table.
+
+    Returns:
+        pd.DataFrame: The trips with the station attribute columns instead of the keys.
+    """
+    joined = trips.drop(columns=[f"{side}_key" for side in SIDES])
+    for side in SIDES:
+        for template in STATION_FIELDS.values():
+            col = template.format(side=side)
+            joined[col] = station_column(stations, trips, col)
+    return joined
@@ -0,0 +1,65 @@
+"""
+Synthetic trips with the layout of the EMT files, for tests and benchmarks without network.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def make_month_data(
+    n_trips: int = 2000, month: int = 2, year: int = 23, seed: int = 0
+) -> pd.DataFrame:
+    """
+    Builds a synthetic DataFrame with the same layout returned by `BiciMad.get_data`,
+    including the all-NaN rows interleaved by EMT's CSV files.
+    """
+    rng = np.random.default_rng(seed)
+    n_stations = 20
+    st_lon = -3.70 + rng.uniform(-0.03, 0.03, n_stations)
+    st_lat = 40.42 + rng.uniform(-0.03, 0.03, n_stations)
+    unlock_st = rng.integers(1, n_stations + 1, n_trips).astype(float)
+    lock_st = rng.integers(1, n_stations + 1, n_trips).astype(float)
+    start = pd.Timestamp(year=2000 + year, month=month, day=1)
+    days_in_month = start.days_in_month
+    unlock_date = (
+        start + pd.to_timedelta(np.sort(rng.integers(0, days_in_month * 86400, n_trips)), unit="s")
+    ).astype("datetime64[ns]")
+    trip_minutes = np.round(rng.gamma(2.0, 6.0, n_trips), 2)
+    lock_date = unlock_date + pd.to_timedelta(trip_minutes * 60, unit="s").round("s")
+
+    def geolocation(stations):
+        idx = stations.astype(int) - 1
+        return [
+            f"{{'type': 'Point', 'coordinates': [{lon:.7f}, {lat:.7f}]}}"
+            for lon, lat in zip(st_lon[idx], st_lat[idx])
+        ]
+
+    trips = pd.DataFrame(
+        {
+            "idBike": rng.integers(1000, 1400, n_trips).astype(float),
+            "fleet": np.ones(n_trips),
+            "trip_minutes": trip_minutes,
+            "geolocation_unlock": geolocation(unlock_st),
+            "address_unlock": [f"'Calle {int(st)} nº 1'" for st in unlock_st],
+            "unlock_date": unlock_date,
+            "locktype": "STATION",
+            "unlocktype": "STATION",
+            "geolocation_lock": geolocation(lock_st),
+            "address_lock": [f"'Calle {int(st)} nº 1'" for st in lock_st],
+            "lock_date": lock_date,
+            "station_unlock": unlock_st,
+            "unlock_station_name": [f"{int(st)} - Station {int(st)}" for st in unlock_st],
+            "station_lock": lock_st,
+            "lock_station_name": [f"{int(st)} - Station {int(st)}" for st in lock_st],
+        },
+        index=pd.DatetimeIndex(unlock_date.normalize(), name="fecha").astype("datetime64[ns]"),
+    )
+    empty = pd.DataFrame(
+        np.nan,
+        index=pd.DatetimeIndex([pd.NaT] * n_trips, name="fecha").astype("datetime64[ns]"),
+        columns=trips.columns,
+    )
+    empty = empty.astype({"unlock_date": "datetime64[ns]", "lock_date": "datetime64[ns]"})
+    data = pd.concat([trips, empty])
+    order = np.argsort(np.concatenate([np.arange(n_trips) * 2, np.arange(n_trips) * 2 + 1]))
+    return data.iloc[order]
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from .geo import parse_coordinates
+from .schemas import INVALID_NUMBERS
+
+# Longest trip (in minutes) considered plausible, a full day.
+MAX_TRIP_MINUTES = 24 * 60
+
+
+def validation_masks(
+    data: pd.DataFrame, month: int, year: int, max_trip_minutes: float = MAX_TRIP_MINUTES
+) -> dict:
+    """
+    Evaluates every data quality rule as a boolean column mask, True where a row fails.
+
+    Rows where every value is missing are never flagged, they are removed by `clean`.
+
+    Args:
+        data (pd.DataFrame): Trips with the layout returned by `BiciMad.get_data`.
+        month (int): The month the data should belong to (1-12).
+        year (int): The year the data should belong to (21-23).
+        max_trip_minutes (float): Longest plausible trip duration in minutes.
+
+    Returns:
+        dict: Mapping from reason code to its mask.
+    """
+    filled = data.drop(columns=INVALID_NUMBERS, errors="ignore").notna().any(axis=1).to_numpy()
+    minutes = data["trip_minutes"].to_numpy(dtype=np.float64)
+    unlock_date, lock_date = data["unlock_date"], data["lock_date"]
+    fecha = pd.DatetimeIndex(data.index)
+    masks = {
+        "negative_trip_minutes": minutes < 0,
+        "absurd_trip_minutes": minutes > max_trip_minutes,
+        "missing_dates": (unlock_date.isna() | lock_date.isna()).to_numpy(),
+        "lock_before_unlock": (lock_date < unlock_date).to_numpy(),
+        "wrong_month": ~((fecha.month == month) & (fecha.year % 100 == year)),
+        # Only flagged when the data was parsed with errors="coerce".
+        "invalid_numbers": data.get(INVALID_NUMBERS, pd.Series(False, index=data.index)),
+    }
+    for category in ["unlock", "lock"]:
+        lon, _ = parse_coordinates(data[f"geolocation_{category}"])
+        masks[f"invalid_geolocation_{category}"] = np.isnan(lon)
+    return {reason: np.asarray(mask, dtype=bool) & filled for reason, mask in masks.items()}
+
+
+def validate(
+    data: pd.DataFrame, month: int, year: int, max_trip_minutes: float = MAX_TRIP_MINUTES
+) -> tuple:
+    """
+    Splits trips into valid rows and quarantined rows that fail any data quality rule.
+
+    Args:
+        data (pd.DataFrame): Trips with the layout returned by `BiciMad.get_data`.
+        month (int): The month the data should belong to (1-12).
+        year (int): The year the data should belong to (21-23).
+        max_trip_minutes (float): Longest plausible trip duration in minutes.
+
+    Returns:
+        tuple: The valid rows (pd.DataFrame), the quarantined rows (pd.DataFrame) with an extra
+            "reasons" column listing the failed rules separated by ";", and the number of failing
+            rows per reason (pd.Series, named "failed_rows").
+    """
+    masks = validation_masks(data, month, year, max_trip_minutes)
+    failed = np.logical_or.reduce(list(masks.values()))
+    reasons = pd.Series("", index=np.flatnonzero(failed), dtype=object)
+    for reason, mask in masks.items():
+        reason_rows = mask[failed]
+        reasons[reason_rows] = reasons[reason_rows] + reason + ";"
+    data = data.drop(columns=INVALID_NUMBERS, errors="ignore")
+    quarantine = data[failed].copy()
+    quarantine["reasons"] = reasons.str.rstrip(";").to_numpy()
+    counts = pd.Series({reason: int(mask.sum()) for reason, mask in masks.items()})
+    counts["total"] = int(failed.sum())
+    counts.name = "failed_rows"
+    return data[~failed], quarantine, counts
@@ -1,21 +1,42 @@
 import io
+import os
 import re
 import zipfile
 from typing import TextIO
 
-import requests
 from decorators.types_decorator import check_args_types
 
 from .constants import date_ranges
+from .session import HttpClient, default_client
 
 
 class UrlEMT:
     # Class constants
     EMT = "https://opendata.emtmadrid.es"
     GENERAL = "/Datos-estaticos/Datos-generales-(1)"
+    BASE_URL_ENV = "BICIMAD_EMT_URL"
 
-    def __init__(self):
-        self._valid_urls: dict = UrlEMT.select_valid_urls()
+    def __init__(self, base_url: str | None = None, client: HttpClient | None = None):
+        """
+        Args:
+            base_url (str | None): Base URL of the EMT portal or of a mirror with the same
+                layout. Defaults to the `BICIMAD_EMT_URL` environment variable if set, otherwise
+                to the public portal.
+            client (HttpClient | None): HTTP client used for the requests. Defaults to the client
+                shared by every instance, so connections and revalidated files are reused.
+        """
+        base_url = base_url or os.environ.get(UrlEMT.BASE_URL_ENV) or UrlEMT.EMT
+        self._base_url: str = base_url.rstrip("/")
+        self._client: HttpClient = client or default_client()
+        self._valid_urls: dict = UrlEMT.select_valid_urls(self._base_url, self._client)
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url
+
+    @property
+    def client(self) -> HttpClient:
+        return self._client
 
     @property
     def valid_urls(self) -> dict:
@@ -23,7 +44,7 @@ class UrlEMT:
 
     @staticmethod
     @check_args_types
-    def select_valid_urls() -> dict:
+    def select_valid_urls(base_url: str = EMT, client: HttpClient | None = None) -> dict:
         """
         Fetches HTML content from a specified URL and extracts valid trip CSV links.
 
@@ -31,6 +52,10 @@ class UrlEMT:
         checks for a successful response, and retrieves the HTML content.
         It then calls the `get_links` function to extract valid URLs from the HTML.
 
+        Args:
+            base_url (str): Base URL of the EMT portal or of a mirror with the same layout.
+            client (HttpClient | None): HTTP client used for the request, the shared one if None.
+
         Returns:
             dict: A dictionary mapping date identifiers to their corresponding full URLs of the
                 trip CSV files. The format is { 'MM_DD': 'full_url' }.
@@ -38,14 +63,13 @@ class UrlEMT:
         Raises:
             HTTPError: If the HTTP request returned an unsuccessful status code.
         """
-        response = requests.get(f"{UrlEMT.EMT}{UrlEMT.GENERAL}")
-        response.raise_for_status()
-        html_content = response.text
-        return UrlEMT.get_links(html_content)
+        client = client or default_client()
+        html_content = client.get_text(f"{base_url}{UrlEMT.GENERAL}")
+        return UrlEMT.get_links(html_content, base_url)
 
     @staticmethod
     @check_args_types
-    def get_links(html: str) -> dict:
+    def get_links(html: str, base_url: str = EMT) -> dict:
         """
         Extracts valid trip CSV links from the provided HTML string.
 
@@ -56,6 +80,7 @@ class UrlEMT:
 
         Args:
             html (str): A string containing the HTML content to search for trip links.
+            base_url (str): Base URL prepended to the relative links found in the HTML.
 
         Returns:
             dict: A dictionary mapping date identifiers to their corresponding full URLs
@@ -68,7 +93,7 @@ class UrlEMT:
         valid_urls = {}
         for link in matches:
             key = re.search(key_ptrn, link).group()
-            valid_urls[key] = f"{UrlEMT.EMT}{link}"
+            valid_urls[key] = f"{base_url}{link}"
         return valid_urls
 
     @staticmethod
@@ -149,6 +174,33 @@ class UrlEMT:
         Returns:
             TextIO: A StringIO object containing the contents of the CSV file.
 
+        Raises:
+            ValueError: If there is an issue retrieving the URL for the specified month and year.
+            HTTPError: If the HTTP request returned an unsuccessful status code when trying to
+            download the ZIP file.
+            KeyError: If the expected CSV file is not found in the ZIP archive.
+        """
+        with self.open_csv(month, year) as f:
+            file_str = io.StringIO(f.read())
+        return file_str
+
+    @check_args_types
+    def open_csv(self, month: int, year: int) -> TextIO:
+        """
+        Downloads the ZIP file for the specified month and year and opens the CSV inside it as a
+        text stream, decompressed and decoded on the fly while it is read.
+
+        Only the compressed ZIP is held in memory, so readers that consume the stream in chunks
+        never hold the whole decompressed CSV. A ZIP downloaded before by the same client is
+        revalidated and, if unchanged, not transferred again.
+
+        Args:
+            month (int): The month for which to retrieve the CSV (1-12).
+            year (int): The year for which to retrieve the CSV (21-23).
+
+        Returns:
+            TextIO: A text stream over the CSV file, to be closed by the caller.
+
         Raises:
             ValueError: If there is an issue retrieving the URL for the specified month and year.
             HTTPError: If the HTTP request returned an unsuccessful status code when trying to
@@ -157,12 +209,6 @@ class UrlEMT:
         """
         url = self.get_url(month, year)
         file_name = UrlEMT.get_file_name_from_url(url)
-        response = requests.get(url)
-        response.raise_for_status()
-        resp_bytes = io.BytesIO(response.content)
+        resp_bytes = io.BytesIO(self._client.get(url))
         zip_file = zipfile.ZipFile(resp_bytes)
-        with zip_file.open(f"{file_name}.csv") as f:
-            contents = f.read()
-            content_str = contents.decode("utf-8")
-            file_str = io.StringIO(content_str)
-        return file_str
+        return io.TextIOWrapper(zip_file.open(f"{file_name}.csv"), encoding="utf-8")
@@ -1,4 +1,5 @@
 from .constants import date_ranges
+from .session import HttpClient
 from .UrlEMT import UrlEMT
 
-__all__ = ["UrlEMT", "date_ranges"]
+__all__ = ["HttpClient", "UrlEMT", "date_ranges"]
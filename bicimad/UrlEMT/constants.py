@@ -2,3 +2,13 @@ date_ranges = {
     "month": [1, 12],
     "year": [21, 23],
 }
+
+# Schema of each monthly file (defined in `BiciMad.schemas`), keyed as in `UrlEMT.valid_urls`
+# ('YY_MM'). Months mapped to None are published but known to be malformed. Kept here, away from
+# pandas, so the command line can list the months without importing the analysis modules.
+MONTH_SCHEMAS = {
+    **{f"21_{month:02}": "trips_v1" for month in range(6, 13)},
+    **{f"22_{month:02}": "trips_v1" for month in range(1, 13)},
+    **{f"23_{month:02}": "trips_v1" for month in range(1, 3)},
+    "21_10": None,
+}
@@ -0,0 +1,120 @@
+"""
+Local mirror of the EMT open data portal.
+
+Usage (from the `bicimad` directory):
+    python -m UrlEMT.mirror sync ./emt_mirror
+    python -m UrlEMT.mirror serve ./emt_mirror --port 8000
+
+Workers then point at the mirror with `UrlEMT(base_url="http://mirror-host:8000")` or by
+exporting `BICIMAD_EMT_URL=http://mirror-host:8000`.
+"""
+
+import argparse
+import functools
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from .session import HttpClient, default_client
+from .UrlEMT import UrlEMT
+
+
+def sync_mirror(
+    directory: str | Path, base_url: str = UrlEMT.EMT, client: HttpClient | None = None
+) -> list:
+    """
+    Downloads the index page and every monthly trips ZIP into a local directory, keeping the
+    same URL layout as the portal. ZIP files already present in the mirror are not downloaded
+    again.
+
+    Args:
+        directory (str | Path): The directory of the mirror.
+        base_url (str): Base URL of the portal (or of another mirror) to sync from.
+        client (HttpClient | None): HTTP client used for the requests, the shared one if None.
+
+    Returns:
+        list: The paths of the newly downloaded files.
+
+    Raises:
+        HTTPError: If any HTTP request returned an unsuccessful status code.
+    """
+    directory = Path(directory)
+    base_url = base_url.rstrip("/")
+    client = client or default_client()
+    html = client.get_text(f"{base_url}{UrlEMT.GENERAL}")
+    index_path = directory / UrlEMT.GENERAL.lstrip("/")
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index_path.write_text(html, encoding="utf-8")
+
+    downloaded = [index_path]
+    for url in UrlEMT.get_links(html, base_url).values():
+        path = directory / urlsplit(url).path.lstrip("/")
+        if path.exists():
+            continue
+        content = client.get(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary name first so an interrupted sync never leaves a partial ZIP.
+        tmp_path = path.with_name(f"{path.name}.part")
+        tmp_path.write_bytes(content)
+        tmp_path.replace(path)
+        downloaded.append(path)
+    return downloaded
+
+
+class MirrorRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the mirror files, reporting the extension-less index page as UTF-8 HTML.
+    """
+
+    def guess_type(self, path):
+        if not Path(path).suffix:
+            return "text/html; charset=utf-8"
+        return super().guess_type(path)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(
+    directory: str | Path, host: str = "0.0.0.0", port: int = 8000
+) -> ThreadingHTTPServer:
+    """
+    Creates an HTTP server for a mirror directory, with the same URL layout as the portal.
+
+    Args:
+        directory (str | Path): The directory of the mirror.
+        host (str): The interface to listen on.
+        port (int): The port to listen on, 0 to pick a free one.
+
+    Returns:
+        ThreadingHTTPServer: The server, not yet started.
+    """
+    handler = functools.partial(MirrorRequestHandler, directory=str(directory))
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main(argv: list | None = None, prog: str | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog=prog, description="Local mirror of the EMT open data portal."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    sync = commands.add_parser("sync", help="download the index page and monthly ZIPs")
+    sync.add_argument("directory")
+    sync.add_argument("--base-url", default=UrlEMT.EMT)
+    serve = commands.add_parser("serve", help="serve a mirror directory over HTTP")
+    serve.add_argument("directory")
+    serve.add_argument("--host", default="0.0.0.0")
+    serve.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    if args.command == "sync":
+        for path in sync_mirror(args.directory, args.base_url):
+            print(path)
+    else:
+        with make_server(args.directory, args.host, args.port) as server:
+            print(f"Serving {args.directory} on http://{args.host}:{server.server_port}")
+            server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
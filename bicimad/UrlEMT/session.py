@@ -0,0 +1,156 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
+
+# Seconds to wait for the connection and between bytes of the response.
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 60
+# Attempts after the first one, waiting backoff_factor * 2 ** (attempt - 1) seconds in between.
+RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+# Keep-alive connections kept open per host.
+POOL_SIZE = 10
+# Responses kept for revalidation. Monthly ZIPs are tens of MB, so only the most recent are kept.
+MAX_ENTRIES = 4
+
+
+class HttpClient:
+    """
+    HTTP client shared by the UrlEMT instances of a process.
+
+    Requests go through a pooled `requests.Session` with timeouts and retries with exponential
+    backoff on connection errors and transient status codes. Responses carrying an `ETag` or
+    `Last-Modified` header are kept, and requesting the same URL again sends `If-None-Match`
+    and `If-Modified-Since`, so an unchanged file is answered with 304 and served from memory.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: int | float = CONNECT_TIMEOUT,
+        read_timeout: int | float = READ_TIMEOUT,
+        retries: int = RETRIES,
+        backoff_factor: int | float = BACKOFF_FACTOR,
+        pool_size: int = POOL_SIZE,
+        max_entries: int = MAX_ENTRIES,
+    ) -> None:
+        """
+        Args:
+            connect_timeout (int | float): Seconds to wait for the connection to be established.
+            read_timeout (int | float): Seconds to wait between bytes of the response.
+            retries (int): Retries of a failed request, 0 to disable them.
+            backoff_factor (int | float): Base of the exponential wait between retries.
+            pool_size (int): Keep-alive connections kept open per host.
+            max_entries (int): Responses kept for conditional requests, 0 to disable them.
+        """
+        self._timeout = (connect_timeout, read_timeout)
+        self._max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.revalidated = 0
+
+        # Imported here so that importing the package stays cheap for commands that never
+        # open a connection.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session = requests.Session()
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    @property
+    def session(self) -> "requests.Session":
+        return self._session
+
+    @property
+    def timeout(self) -> tuple:
+        return self._timeout
+
+    def get(self, url: str) -> bytes:
+        """
+        Downloads the content of a URL, revalidating the stored copy if there is one.
+
+        Args:
+            url (str): The URL to download.
+
+        Returns:
+            bytes: The body of the response, or the stored copy if the server answered 304.
+
+        Raises:
+            HTTPError: If the HTTP request returned an unsuccessful status code.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = self._session.get(url, headers=headers, timeout=self._timeout)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.revalidated += 1
+                if url in self._entries:
+                    self._entries.move_to_end(url)
+            return entry["content"]
+        response.raise_for_status()
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if self._max_entries > 0 and (etag or last_modified):
+            with self._lock:
+                self._entries[url] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "content": response.content,
+                }
+                self._entries.move_to_end(url)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+        return response.content
+
+    def get_text(self, url: str) -> str:
+        """
+        Like `get`, decoding the body as UTF-8.
+        """
+        return self.get(url).decode("utf-8", errors="replace")
+
+    def clear(self) -> None:
+        """
+        Forgets the stored responses, so the next requests download the files again.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections.
+        """
+        self._session.close()
+
+
+_default_client: HttpClient | None = None
+
+
+def default_client() -> HttpClient:
+    """
+    Returns the client shared by default by every UrlEMT instance, creating it on first use.
+    """
+    global _default_client
+    if _default_client is None:
+        _default_client = HttpClient()
+    return _default_client
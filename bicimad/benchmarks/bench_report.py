@@ -0,0 +1,55 @@
+"""
+Compares `BiciMad.report` against calling the report methods one by one.
+
+Usage (from the `bicimad` directory):
+    python -m benchmarks.bench_report --month 2 --year 23
+    python -m benchmarks.bench_report --synthetic 500000
+"""
+
+import argparse
+import time
+
+from BiciMad.BiciMad import BiciMad
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def one_by_one(bicimad_obj: BiciMad) -> None:
+    bicimad_obj.resume()
+    bicimad_obj.day_time()
+    bicimad_obj.weekday_time()
+    bicimad_obj.total_usage_day()
+    bicimad_obj.usage_by_date_and_unlock_st()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--month", type=int, default=2)
+    parser.add_argument("--year", type=int, default=23)
+    parser.add_argument("--synthetic", type=int, default=0, help="number of synthetic trips")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from BiciMad.synthetic import make_month_data
+
+        data = make_month_data(args.synthetic, args.month, args.year)
+    else:
+        data = BiciMad.get_data(args.month, args.year)
+
+    period = (args.month, args.year)
+    methods, fused = [], []
+    for _ in range(args.repeat):
+        methods.append(timed(lambda: one_by_one(BiciMad.from_dataframe(*period, data.copy()))))
+        fused.append(timed(lambda: BiciMad.from_dataframe(*period, data.copy()).report()))
+    print(f"rows: {data.shape[0]}")
+    print(f"methods one by one: {min(methods):.3f} s")
+    print(f"report():           {min(fused):.3f} s ({min(methods) / min(fused):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Command line interface of the package.
+
+Usage:
+    bicimad months [--remote]
+    bicimad fetch 2 23 --output trips_23_02.csv --database trips.sqlite3 --sketches sketches
+    bicimad report 22_06 23_02 --output reports --format json --workers 4 --sketches sketches
+    bicimad mirror sync ./emt_mirror
+
+pandas, requests and the analysis modules are only imported by the commands that use them, so
+metadata commands such as `months` start without paying for them.
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+from UrlEMT.constants import MONTH_SCHEMAS
+
+FORMATS = ["json", "parquet"]
+# Engines pandas can write Parquet with, installed with the `parquet` extra.
+PARQUET_ENGINES = ["pyarrow", "fastparquet"]
+
+
+def period(value: str) -> tuple:
+    """
+    Parses a 'YY_MM' month key into a (month, year) tuple.
+    """
+    try:
+        year, month = (int(part) for part in value.split("_"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a month as YY_MM, got: {value}")
+    if not 1 <= month <= 12:
+        raise argparse.ArgumentTypeError(f"month has to be between 1 and 12, got: {month}")
+    return month, year
+
+
+def supported_months() -> list:
+    """
+    Lists the 'YY_MM' keys of the months with a known schema, in chronological order.
+    """
+    return sorted(key for key, schema in MONTH_SCHEMAS.items() if schema is not None)
+
+
+def months_command(args) -> None:
+    if args.remote:
+        from UrlEMT.UrlEMT import UrlEMT
+
+        keys = sorted(UrlEMT(base_url=args.base_url).valid_urls)
+    else:
+        keys = supported_months()
+    for key in keys:
+        print(key)
+
+
+def use_base_url(base_url: str | None) -> None:
+    """
+    Points every UrlEMT created by this process and its workers at a mirror, if given.
+    """
+    if base_url:
+        from UrlEMT.UrlEMT import UrlEMT
+
+        os.environ[UrlEMT.BASE_URL_ENV] = base_url
+
+
+def fetch_command(args) -> None:
+    use_base_url(args.base_url)
+    if args.database or args.sketches:
+        from BiciMad.BiciMad import BiciMad
+
+        bicimad_obj = BiciMad(args.month, args.year, validate=args.validate)
+        if args.database:
+            from BiciMad.database import TripsDatabase
+
+            with TripsDatabase(args.database) as database:
+                trips = bicimad_obj.to_database(database)
+            print(f"{args.database}: {trips} trips loaded for {args.year}_{args.month:02}")
+        if args.sketches:
+            from sketches import SketchStore
+
+            for path in bicimad_obj.save_sketches(SketchStore(args.sketches)):
+                print(path)
+    if args.output or not (args.database or args.sketches):
+        from UrlEMT.UrlEMT import UrlEMT
+
+        output = Path(args.output or f"trips_{args.year}_{args.month:02}.csv")
+        with UrlEMT().open_csv(args.month, args.year) as csv_file, output.open("w") as out_file:
+            for line in csv_file:
+                out_file.write(line)
+        print(output)
+
+
+def report_frames(report: dict) -> dict:
+    """
+    Converts the outputs of `BiciMad.report` into flat DataFrames, one per output, with the
+    index turned into columns.
+    """
+    import pandas as pd
+
+    frames = {"resume": pd.DataFrame([report["resume"].to_dict()])}
+    for name, output in report.items():
+        if name != "resume":
+            if output.index.nlevels == 1 and output.index.name is None:
+                # `day_time` is indexed by day without an index name, as in the trips data.
+                output = output.rename_axis("fecha")
+            frames[name] = output.reset_index()
+    return frames
+
+
+def write_report(
+    month: int, year: int, output: str, fmt: str, validate: bool, sketches: str | None = None
+) -> list:
+    """
+    Builds the report of a month and writes it into the output directory, as a single JSON
+    file ('report_YY_MM.json') or as one Parquet file per output ('report_YY_MM_<name>.parquet'),
+    and saves the month sketches into the `sketches` store if given.
+
+    Runs in the worker processes of the `report` command.
+
+    Returns:
+        list: The paths of the written files.
+    """
+    from BiciMad.BiciMad import BiciMad
+
+    bicimad_obj = BiciMad(month, year, validate=validate)
+    frames = report_frames(bicimad_obj.report())
+    output = Path(output)
+    stem = f"report_{year}_{month:02}"
+    if fmt == "json":
+        content = {
+            name: json.loads(frame.to_json(orient="records", date_format="iso"))
+            for name, frame in frames.items()
+        }
+        path = output / f"{stem}.json"
+        path.write_text(json.dumps(content, indent=2, ensure_ascii=False), encoding="utf-8")
+        paths = [path]
+    else:
+        paths = []
+        for name, frame in frames.items():
+            path = output / f"{stem}_{name}.parquet"
+            frame.to_parquet(path)
+            paths.append(path)
+    if sketches:
+        from sketches import SketchStore
+
+        paths += bicimad_obj.save_sketches(SketchStore(sketches))
+    return paths
+
+
+def parquet_available() -> bool:
+    """
+    Checks whether a Parquet engine is installed, without importing it.
+    """
+    from importlib.util import find_spec
+
+    return any(find_spec(engine) is not None for engine in PARQUET_ENGINES)
+
+
+def report_command(args) -> int:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from sketches.store import month_range
+
+    if args.format == "parquet" and not parquet_available():
+        print("--format parquet requires pyarrow (the 'parquet' extra)", file=sys.stderr)
+        return 2
+    use_base_url(args.base_url)
+
+    periods = []
+    for month, year in month_range(args.start, args.end):
+        if MONTH_SCHEMAS.get(f"{year}_{month:02}") is None:
+            print(f"skipping {year}_{month:02}: no usable data", file=sys.stderr)
+        else:
+            periods.append((month, year))
+    Path(args.output).mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(
+                write_report, month, year, args.output, args.format, args.validate, args.sketches
+            ): (month, year)
+            for month, year in periods
+        }
+        for future in as_completed(futures):
+            month, year = futures[future]
+            try:
+                for path in future.result():
+                    print(path)
+            except Exception as error:
+                failed += 1
+                print(f"{year}_{month:02} failed: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def mirror_command(args) -> None:
+    from UrlEMT.mirror import main as mirror_main
+
+    mirror_main(args.args, prog="bicimad mirror")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="bicimad", description="BiciMAD open data tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    months = commands.add_parser("months", help="list the months with usable trip data")
+    months.add_argument(
+        "--remote", action="store_true", help="list the months published by the portal instead"
+    )
+    months.add_argument("--base-url", default=None)
+    months.set_defaults(func=months_command)
+
+    fetch = commands.add_parser("fetch", help="download the trips of a month")
+    fetch.add_argument("month", type=int)
+    fetch.add_argument("year", type=int)
+    fetch.add_argument("--output", help="CSV file to write, defaults to trips_YY_MM.csv")
+    fetch.add_argument("--database", help="also load the cleaned trips into a SQLite database")
+    fetch.add_argument("--validate", action="store_true")
+    fetch.add_argument("--sketches", help="also save the month sketches into this directory")
+    fetch.add_argument("--base-url", default=None)
+    fetch.set_defaults(func=fetch_command)
+
+    report = commands.add_parser("report", help="build the reports of a range of months")
+    report.add_argument("start", type=period, help="first month, as YY_MM")
+    report.add_argument("end", type=period, help="last month, as YY_MM")
+    report.add_argument("--output", default=".", help="directory of the report files")
+    report.add_argument("--format", choices=FORMATS, default="json")
+    report.add_argument("--workers", type=int, default=None, help="defaults to the CPU count")
+    report.add_argument("--validate", action="store_true")
+    report.add_argument("--sketches", help="also save the month sketches into this directory")
+    report.add_argument("--base-url", default=None)
+    report.set_defaults(func=report_command)
+
+    mirror = commands.add_parser(
+        "mirror", help="sync or serve a local mirror of the portal", add_help=False
+    )
+    mirror.set_defaults(func=mirror_command)
+    return parser
+
+
+def main(argv: list | None = None) -> int:
+    parser = build_parser()
+    # The mirror subcommands and their options are parsed by `UrlEMT.mirror` itself.
+    args, extra = parser.parse_known_args(argv)
+    if extra and args.func is not mirror_command:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.args = extra
+    return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
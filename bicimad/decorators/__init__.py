@@ -1,3 +1,4 @@
+from .cache_decorator import bumps_version, memoize_result
 from .types_decorator import check_args_types
 
-__all__ = ["check_args_types"]
+__all__ = ["bumps_version", "check_args_types", "memoize_result"]
@@ -0,0 +1,45 @@
+import copy
+from functools import wraps
+
+
+def bumps_version(func):
+    """
+    Marks a method as mutating the instance data: the data version is bumped before running it,
+    so every result memoized with `memoize_result` becomes stale.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        self._version += 1
+        return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def memoize_result(func):
+    """
+    Memoizes a method result on the instance, keyed by method name, arguments and data version.
+
+    The instance must define `_version` (int), `_cache` (OrderedDict) and `_cache_size` (int,
+    0 disables the cache). Results are stored with the version reached once the method returns
+    (methods may clean the data first), served as deep copies so callers cannot alter cached
+    values, and evicted least recently used first.
+    """
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self._cache_size <= 0:
+            return func(self, *args, **kwargs)
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == self._version:
+            self._cache.move_to_end(key)
+            return copy.deepcopy(cached[1])
+        result = func(self, *args, **kwargs)
+        self._cache[key] = (self._version, result)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return copy.deepcopy(result)
+
+    return wrapper
@@ -12,7 +12,7 @@ def check_args_types(func):
             if expected_type and not isinstance(arg_value, expected_type):
                 raise TypeError(
                     f"Expected '{arg_name}' param to be "
-                    f"{expected_type.__name__},"
+                    f"{getattr(expected_type, '__name__', expected_type)},"
                     f" got {type(arg_value).__name__} instead."
                 )
         return func(*args, **kwargs)
@@ -0,0 +1,5 @@
+from .hyperloglog import HyperLogLog
+from .store import SketchStore, month_range
+from .tdigest import TDigest
+
+__all__ = ["HyperLogLog", "SketchStore", "TDigest", "month_range"]
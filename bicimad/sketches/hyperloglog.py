@@ -0,0 +1,170 @@
+import base64
+
+import numpy as np
+import pandas as pd
+
+
+class HyperLogLog:
+    """
+    Mergeable approximate distinct counter (HyperLogLog with 64 bit hashes).
+
+    A sketch uses 2 ** precision one byte registers and estimates the number of distinct
+    values with a relative standard error of 1.04 / sqrt(2 ** precision) (0.81% for the
+    default precision of 14). Sketches with the same precision merge losslessly by taking
+    the register-wise maximum, so counts compose across chunks, days, stations and months.
+    """
+
+    def __init__(self, precision: int = 14) -> None:
+        if not (4 <= precision <= 18):
+            raise ValueError(f"Precision has to be a value between 4 and 18, got: {precision}")
+        self._precision = precision
+        self._registers = np.zeros(2**precision, dtype=np.uint8)
+
+    @property
+    def precision(self) -> int:
+        return self._precision
+
+    @property
+    def registers(self) -> np.ndarray:
+        return self._registers
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / np.sqrt(self._registers.size)
+
+    @staticmethod
+    def hash_values(values) -> np.ndarray:
+        """
+        Hashes values into 64 bit unsigned integers with pandas' vectorized hashing.
+
+        Args:
+            values (array-like): The values to hash.
+
+        Returns:
+            np.ndarray: One uint64 hash per value.
+        """
+        return pd.util.hash_array(np.asarray(values, dtype=object))
+
+    @staticmethod
+    def _index_and_rank(hashes: np.ndarray, precision: int) -> tuple:
+        """
+        Splits hashes into the register index (first `precision` bits) and the rank of the
+        first set bit in the remaining bits.
+        """
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - precision)).astype(np.int64)
+        # The sentinel bit bounds the rank when every remaining bit is zero.
+        rest = (hashes << np.uint64(precision)) | np.uint64(1 << (precision - 1))
+        high = (rest >> np.uint64(32)).astype(np.float64)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+        rank = (65 - bit_length).astype(np.uint8)
+        return index, rank
+
+    def update(self, values) -> None:
+        """
+        Adds a batch of values to the sketch. Missing values are ignored.
+
+        Args:
+            values (array-like): The values to count.
+        """
+        values = pd.Series(values).dropna()
+        if values.empty:
+            return
+        index, rank = HyperLogLog._index_and_rank(
+            HyperLogLog.hash_values(values.to_numpy()), self._precision
+        )
+        np.maximum.at(self._registers, index, rank)
+
+    @classmethod
+    def from_groups(cls, groups, values, precision: int = 14) -> dict:
+        """
+        Builds one sketch per group in a single vectorized pass.
+
+        Args:
+            groups (array-like): Group label of every value (e.g. day or station).
+            values (array-like): The values to count.
+            precision (int): Precision of the sketches.
+
+        Returns:
+            dict: Mapping from group label to its sketch.
+        """
+        frame = pd.DataFrame({"group": groups, "value": values}).dropna()
+        codes, labels = pd.factorize(frame["group"], sort=True)
+        index, rank = cls._index_and_rank(
+            cls.hash_values(frame["value"].to_numpy()), precision
+        )
+        size = 2**precision
+        registers = np.zeros(labels.size * size, dtype=np.uint8)
+        np.maximum.at(registers, codes * size + index, rank)
+        sketches = {}
+        for i, label in enumerate(labels):
+            sketch = cls(precision)
+            sketch._registers = registers[i * size : (i + 1) * size].copy()
+            sketches[label] = sketch
+        return sketches
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Merges another sketch into this one.
+
+        Args:
+            other (HyperLogLog): The sketch to merge, with the same precision.
+
+        Returns:
+            HyperLogLog: This sketch, to allow chaining.
+        """
+        if not isinstance(other, HyperLogLog):
+            raise TypeError(
+                f"Expected 'other' param to be HyperLogLog, got {type(other).__name__}"
+            )
+        if other.precision != self._precision:
+            raise ValueError(
+                f"Cannot merge sketches with precision {self._precision} and {other.precision}"
+            )
+        np.maximum(self._registers, other._registers, out=self._registers)
+        return self
+
+    def count(self) -> float:
+        """
+        Estimates the number of distinct values added to the sketch.
+
+        Returns:
+            float: The estimated distinct count.
+        """
+        m = self._registers.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self._registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self._registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+    def to_dict(self) -> dict:
+        """
+        Serializes the sketch into a JSON friendly dictionary.
+
+        Returns:
+            dict: The precision and the base64 encoded registers.
+        """
+        return {
+            "precision": self._precision,
+            "registers": base64.b64encode(self._registers.tobytes()).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, content: dict) -> "HyperLogLog":
+        """
+        Rebuilds a sketch previously serialized with `to_dict`.
+
+        Args:
+            content (dict): The serialized sketch.
+
+        Returns:
+            HyperLogLog: The rebuilt sketch.
+        """
+        sketch = cls(content["precision"])
+        registers = np.frombuffer(base64.b64decode(content["registers"]), dtype=np.uint8)
+        sketch._registers = registers.copy()
+        return sketch
@@ -0,0 +1,113 @@
+import json
+from pathlib import Path
+
+from .hyperloglog import HyperLogLog
+from .tdigest import TDigest
+
+SKETCH_TYPES = {
+    "tdigest": TDigest,
+    "hyperloglog": HyperLogLog,
+}
+
+
+class SketchStore:
+    """
+    Persists per-month sketches as JSON files inside a directory, one file per sketch kind
+    and month (format: '<kind>_YY_MM.json'), and merges them over arbitrary month ranges.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def path(self, kind: str, month: int, year: int) -> Path:
+        return self._directory / f"{kind}_{year}_{month:02}.json"
+
+    def save(self, kind: str, month: int, year: int, sketches: dict) -> Path:
+        """
+        Saves a group of sketches of the same kind for a given month and year.
+
+        Args:
+            kind (str): Sketch kind, one of the keys of `SKETCH_TYPES`.
+            month (int): The month the sketches were built from.
+            year (int): The year the sketches were built from.
+            sketches (dict): Mapping from key (e.g. "station:<id>") to sketch.
+
+        Returns:
+            Path: The path of the written file.
+        """
+        if kind not in SKETCH_TYPES:
+            raise ValueError(f"Unknown sketch kind: {kind}")
+        path = self.path(kind, month, year)
+        content = {str(key): sketch.to_dict() for key, sketch in sketches.items()}
+        path.write_text(json.dumps(content))
+        return path
+
+    def load(self, kind: str, month: int, year: int) -> dict:
+        """
+        Loads the sketches of a given kind saved for a month and year.
+
+        Args:
+            kind (str): Sketch kind, one of the keys of `SKETCH_TYPES`.
+            month (int): The month of the sketches.
+            year (int): The year of the sketches.
+
+        Returns:
+            dict: Mapping from key to sketch.
+
+        Raises:
+            FileNotFoundError: If no sketches were saved for that month and year.
+        """
+        if kind not in SKETCH_TYPES:
+            raise ValueError(f"Unknown sketch kind: {kind}")
+        content = json.loads(self.path(kind, month, year).read_text())
+        sketch_cls = SKETCH_TYPES[kind]
+        return {key: sketch_cls.from_dict(value) for key, value in content.items()}
+
+    def merged(self, kind: str, periods: list, key: str | list = "all"):
+        """
+        Merges the sketches stored under `key` across several months.
+
+        Months where the key is missing (e.g. a station that did not exist yet) are skipped.
+
+        Args:
+            kind (str): Sketch kind, one of the keys of `SKETCH_TYPES`.
+            periods (list): List of (month, year) tuples to merge.
+            key (str | list): The sketch key to merge, "all" for the whole month, or a list of
+                keys (e.g. several days) to merge together.
+
+        Returns:
+            The merged sketch.
+        """
+        keys = [str(k) for k in key] if isinstance(key, list) else [str(key)]
+        merged = None
+        for month, year in periods:
+            sketches = self.load(kind, month, year)
+            for sketch in (sketches[k] for k in keys if k in sketches):
+                merged = sketch if merged is None else merged.merge(sketch)
+        if merged is None:
+            raise KeyError(f"No '{kind}' sketch found for key {key} in the requested periods")
+        return merged
+
+
+def month_range(start: tuple, end: tuple) -> list:
+    """
+    Lists every (month, year) tuple between two months, both included.
+
+    Args:
+        start (tuple): First (month, year) of the range.
+        end (tuple): Last (month, year) of the range.
+
+    Returns:
+        list: The (month, year) tuples in chronological order.
+    """
+    (month, year), (end_month, end_year) = start, end
+    periods = []
+    while (year, month) <= (end_year, end_month):
+        periods.append((month, year))
+        month, year = (1, year + 1) if month == 12 else (month + 1, year)
+    return periods
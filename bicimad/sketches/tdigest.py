@@ -0,0 +1,143 @@
+import numpy as np
+
+
+class TDigest:
+    """
+    Mergeable streaming quantile sketch (merging t-digest).
+
+    Values are summarized as a bounded set of weighted centroids whose size is
+    controlled by `compression`. Digests built on different chunks, stations or
+    months can be merged and queried for any quantile with a relative error that
+    is smallest at the tails (p95, p99) and never above ~1/compression in rank.
+    """
+
+    def __init__(self, compression: int = 100) -> None:
+        self._compression = compression
+        self._means = np.empty(0, dtype=np.float64)
+        self._weights = np.empty(0, dtype=np.float64)
+        self._min = np.inf
+        self._max = -np.inf
+
+    @property
+    def compression(self) -> int:
+        return self._compression
+
+    @property
+    def count(self) -> float:
+        return float(self._weights.sum())
+
+    @property
+    def centroids(self) -> int:
+        return self._means.size
+
+    def update(self, values) -> None:
+        """
+        Adds a batch of values to the digest. NaN values are ignored.
+
+        Args:
+            values (array-like): Values to add to the digest.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self._min = min(self._min, float(values.min()))
+        self._max = max(self._max, float(values.max()))
+        self._compress(
+            np.concatenate([self._means, values]),
+            np.concatenate([self._weights, np.ones(values.size)]),
+        )
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """
+        Merges another digest into this one.
+
+        Args:
+            other (TDigest): The digest to merge.
+
+        Returns:
+            TDigest: This digest, to allow chaining.
+        """
+        if not isinstance(other, TDigest):
+            raise TypeError(f"Expected 'other' param to be TDigest, got {type(other).__name__}")
+        if other.centroids == 0:
+            return self
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        self._compress(
+            np.concatenate([self._means, other._means]),
+            np.concatenate([self._weights, other._weights]),
+        )
+        return self
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        """
+        Sorts centroids and merges neighbours so that each resulting centroid spans at most
+        one unit of the arcsine scale function, which bounds the digest size by `compression`.
+        """
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q_mid = (np.cumsum(weights) - weights / 2) / total
+        k = self._compression / (2 * np.pi) * np.arcsin(2 * q_mid - 1)
+        cluster = np.floor(k - k[0]).astype(np.int64)
+        cluster = np.unique(cluster, return_inverse=True)[1]
+        new_weights = np.bincount(cluster, weights=weights)
+        self._means = np.bincount(cluster, weights=means * weights) / new_weights
+        self._weights = new_weights
+
+    def quantile(self, q) -> np.ndarray | float:
+        """
+        Estimates one or several quantiles of the values added to the digest.
+
+        Args:
+            q (float | array-like): Quantile(s) in the [0, 1] range.
+
+        Returns:
+            float | np.ndarray: The estimated quantile(s), NaN if the digest is empty.
+        """
+        q_arr = np.asarray(q, dtype=np.float64)
+        if np.any((q_arr < 0) | (q_arr > 1)):
+            raise ValueError(f"Quantiles have to be values between 0 and 1, got: {q}")
+        if self.centroids == 0:
+            result = np.full(q_arr.shape, np.nan)
+        else:
+            total = self._weights.sum()
+            centers = np.cumsum(self._weights) - self._weights / 2
+            xp = np.concatenate([[0.0], centers, [total]])
+            fp = np.concatenate([[self._min], self._means, [self._max]])
+            result = np.interp(q_arr * total, xp, fp)
+        return float(result) if result.ndim == 0 else result
+
+    def to_dict(self) -> dict:
+        """
+        Serializes the digest into a JSON friendly dictionary.
+
+        Returns:
+            dict: The compression, extremes and centroids of the digest.
+        """
+        return {
+            "compression": self._compression,
+            "min": self._min if self.centroids else None,
+            "max": self._max if self.centroids else None,
+            "means": self._means.tolist(),
+            "weights": self._weights.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, content: dict) -> "TDigest":
+        """
+        Rebuilds a digest previously serialized with `to_dict`.
+
+        Args:
+            content (dict): The serialized digest.
+
+        Returns:
+            TDigest: The rebuilt digest.
+        """
+        digest = cls(content["compression"])
+        digest._means = np.asarray(content["means"], dtype=np.float64)
+        digest._weights = np.asarray(content["weights"], dtype=np.float64)
+        if digest.centroids:
+            digest._min, digest._max = content["min"], content["max"]
+        return digest
@@ -0,0 +1,56 @@
+import io
+import threading
+import zipfile
+from http.server import ThreadingHTTPServer
+
+import pytest
+from BiciMad.synthetic import make_month_data
+from UrlEMT.mirror import make_server
+
+
+@pytest.fixture
+def month_data():
+    return make_month_data()
+
+
+LINK = "/getattachment/7a88cb04-9007-4520-88c5-a94c71a0b925/trips_23_02_February-csv.aspx"
+INDEX = (
+    f'<a target="_blank" href="{LINK}" title="Datos de uso de febrero de 2023. Nueva ventana" > '
+    "Datos de uso de febrero de 2023</a>"
+)
+CSV = "fecha;idBike\n2023-02-01;7337.0\n"
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(directory=None, handler=None):
+        # Serves a mirror directory, or any request handler class (e.g. a failing upstream).
+        if handler is None:
+            server = make_server(directory, "127.0.0.1", 0)
+        else:
+            server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_port}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    root = tmp_path / "upstream"
+    index = root / "Datos-estaticos" / "Datos-generales-(1)"
+    index.parent.mkdir(parents=True)
+    index.write_text(INDEX, encoding="utf-8")
+    zip_path = root / LINK.lstrip("/")
+    zip_path.parent.mkdir(parents=True)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr("trips_23_02_February.csv", CSV)
+    zip_path.write_bytes(buffer.getvalue())
+    return root
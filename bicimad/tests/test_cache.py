@@ -0,0 +1,54 @@
+import pytest
+from BiciMad.BiciMad import BiciMad
+from pandas.testing import assert_series_equal
+
+cached_methods_test_cases = [
+    ("resume", (True,)),
+    ("day_time", ()),
+    ("weekday_time", ()),
+    ("total_usage_day", ()),
+    ("usage_by_date_and_unlock_st", ()),
+    ("info_most_popular_stations", (False,)),
+]
+
+
+@pytest.mark.parametrize("method, args", cached_methods_test_cases)
+def test_memoized_results(month_data, method, args):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    first = getattr(bicimad_obj, method)(*args)
+    version = bicimad_obj._version
+    second = getattr(bicimad_obj, method)(*args)
+
+    assert bicimad_obj._version == version
+    assert first.equals(second) and first is not second
+    assert len(bicimad_obj._cache) >= 1
+
+
+def test_mutations_invalidate_cache(month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    total = bicimad_obj.total_usage_day()
+    total.iloc[0] = -1
+    assert bicimad_obj.total_usage_day().iloc[0] != -1
+
+    bicimad_obj.data.iloc[0, bicimad_obj.data.columns.get_loc("address_unlock")] = " 'new' "
+    bicimad_obj.format_string_col("address_unlock")
+    assert bicimad_obj.data["address_unlock"].iloc[0] == "new"
+    usage = bicimad_obj.total_usage_day()
+
+    bicimad_obj.data.drop(bicimad_obj.data.index[:5], inplace=True)
+    bicimad_obj.clear_cache()
+    assert bicimad_obj.total_usage_day().sum() < usage.sum()
+
+
+cache_size_test_cases = [0, 1, 3]
+
+
+@pytest.mark.parametrize("size", cache_size_test_cases)
+def test_cache_size(month_data, size):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    bicimad_obj.cache_size = size
+    expected = bicimad_obj.day_time()
+    for method in ["day_time", "weekday_time", "total_usage_day", "day_time"]:
+        getattr(bicimad_obj, method)()
+    assert len(bicimad_obj._cache) <= size
+    assert_series_equal(bicimad_obj.day_time(), expected)
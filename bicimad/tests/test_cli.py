@@ -0,0 +1,141 @@
+import argparse
+import io
+import json
+import subprocess
+import sys
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from BiciMad.synthetic import make_month_data
+from cli.main import main, period, supported_months
+from sketches import SketchStore
+from tests.conftest import CSV, LINK
+
+
+def test_months(capsys):
+    assert main(["months"]) == 0
+    months = capsys.readouterr().out.split()
+    assert months == supported_months()
+    assert months[0] == "21_06" and months[-1] == "23_02"
+    assert "21_10" not in months
+
+
+package_imports_test_cases = [
+    # The package classes stay importable after their submodules were imported.
+    "import BiciMad.BiciMad, UrlEMT.mirror\n"
+    "from BiciMad import BiciMad\n"
+    "from UrlEMT import UrlEMT\n"
+    "assert isinstance(BiciMad, type) and isinstance(UrlEMT, type)",
+    # Listing the months does not load pandas.
+    "import sys\n"
+    "from cli.main import main\n"
+    "main(['months'])\n"
+    "assert 'pandas' not in sys.modules",
+]
+
+
+@pytest.mark.parametrize("code", package_imports_test_cases)
+def test_package_imports(code):
+    root = Path(__file__).parents[1]
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, cwd=root)
+
+
+def test_months_remote(capsys, upstream, serve):
+    main(["months", "--remote", "--base-url", serve(upstream)])
+    assert capsys.readouterr().out.split() == ["23_02"]
+
+
+def publish_month(upstream, trips):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr("trips_23_02_February.csv", make_month_data(trips).to_csv(sep=";"))
+    (upstream / LINK.lstrip("/")).write_bytes(buffer.getvalue())
+
+
+def test_fetch(capsys, monkeypatch, tmp_path, upstream, serve):
+    # Restored after the test, --base-url overrides it for the rest of the process.
+    monkeypatch.setenv("BICIMAD_EMT_URL", "http://127.0.0.1:9")
+    output = tmp_path / "trips.csv"
+    main(["fetch", "2", "23", "--output", str(output), "--base-url", serve(upstream)])
+    assert output.read_text() == CSV
+    assert capsys.readouterr().out.strip() == str(output)
+
+
+def test_fetch_sketches(capsys, monkeypatch, tmp_path, upstream, serve):
+    publish_month(upstream, 500)
+    monkeypatch.setenv("BICIMAD_EMT_URL", serve(upstream))
+    monkeypatch.chdir(tmp_path)
+    main(["fetch", "2", "23", "--sketches", "sketches"])
+    assert capsys.readouterr().out.split() == [
+        "sketches/tdigest_23_02.json",
+        "sketches/hyperloglog_23_02.json",
+    ]
+    assert SketchStore("sketches").merged("tdigest", [(2, 23)]).count == 500
+    assert not (tmp_path / "trips_23_02.csv").exists()
+
+
+def test_report(capsys, monkeypatch, tmp_path, upstream, serve):
+    publish_month(upstream, 500)
+    monkeypatch.setenv("BICIMAD_EMT_URL", serve(upstream))
+
+    output, sketches = tmp_path / "reports", tmp_path / "sketches"
+    argv = ["report", "23_01", "23_02", "--output", str(output), "--sketches", str(sketches)]
+    assert main([*argv, "--workers", "2"]) == 1
+    captured = capsys.readouterr()
+    assert "23_01 failed" in captured.err
+    assert captured.out.split() == [
+        str(output / "report_23_02.json"),
+        str(sketches / "tdigest_23_02.json"),
+        str(sketches / "hyperloglog_23_02.json"),
+    ]
+    assert SketchStore(sketches).load("hyperloglog", 2, 23)["all"].count() > 0
+
+    report = json.loads((output / "report_23_02.json").read_text())
+    assert report["resume"][0]["total_uses"] == 500
+    assert sum(day["total_usage"] for day in report["total_usage_day"]) == 500
+    assert len(report["usage_by_date_and_unlock_st"][0]) == 3
+    assert set(report["day_time"][0]) == {"fecha", "total_hours"}
+
+
+def test_report_parquet(capsys, monkeypatch, tmp_path, upstream, serve):
+    pytest.importorskip("pyarrow")
+    publish_month(upstream, 500)
+    monkeypatch.setenv("BICIMAD_EMT_URL", serve(upstream))
+
+    output = tmp_path / "reports"
+    assert main(["report", "23_02", "23_02", "--output", str(output), "--format", "parquet"]) == 0
+    assert len(capsys.readouterr().out.split()) == 5
+    resume = pd.read_parquet(output / "report_23_02_resume.parquet")
+    assert resume["total_uses"].iloc[0] == 500
+
+
+def test_report_parquet_engine(capsys, monkeypatch, tmp_path):
+    monkeypatch.setattr("cli.main.PARQUET_ENGINES", ["missing_parquet_engine"])
+    output = tmp_path / "reports"
+    assert main(["report", "23_02", "23_02", "--output", str(output), "--format", "parquet"]) == 2
+    assert "pyarrow" in capsys.readouterr().err
+    assert not output.exists()
+
+
+period_test_cases = [
+    ("23_02", (2, 23)),
+    ("21_12", (12, 21)),
+    ("23-02", argparse.ArgumentTypeError),
+    ("23_13", argparse.ArgumentTypeError),
+]
+
+
+@pytest.mark.parametrize("value, expected", period_test_cases)
+def test_period(value, expected):
+    if isinstance(expected, type) and issubclass(expected, Exception):
+        with pytest.raises(expected):
+            period(value)
+    else:
+        assert period(value) == expected
+
+
+def test_unknown_arguments():
+    with pytest.raises(SystemExit):
+        main(["months", "--bogus"])
@@ -0,0 +1,58 @@
+import pandas as pd
+import pytest
+from BiciMad.BiciMad import BiciMad
+from BiciMad.database import TripsDatabase
+from BiciMad.synthetic import make_month_data
+
+
+@pytest.fixture
+def database(tmp_path):
+    with TripsDatabase(tmp_path / "trips.sqlite3") as trips_db:
+        yield trips_db
+
+
+def test_ingest_and_query(database):
+    feb = BiciMad.from_dataframe(2, 23, make_month_data(500, 2, 23))
+    jan = BiciMad.from_dataframe(1, 23, make_month_data(300, 1, 23, seed=1))
+    jan.normalize()
+    assert feb.to_database(database) == 500
+    assert jan.to_database(database) == 300
+    assert feb.to_database(database) == 500
+
+    months = database.months()
+    assert months.to_dict("list") == {"year": [23, 23], "month": [1, 2], "trips": [300, 500]}
+
+    result = BiciMad.sql(
+        "SELECT station_unlock, COUNT(*) AS amount FROM trips WHERE month = ? "
+        "GROUP BY station_unlock ORDER BY station_unlock",
+        database.path,
+        (2,),
+    )
+    expected = pd.to_numeric(feb.data["station_unlock"]).value_counts().sort_index()
+    assert result["station_unlock"].tolist() == expected.index.astype(int).tolist()
+    assert result["amount"].tolist() == expected.tolist()
+
+    day = BiciMad.sql(
+        "SELECT fecha, SUM(trip_minutes) / 60 AS total_hours, COUNT(DISTINCT idBike) AS bikes "
+        "FROM trips WHERE fecha = :day GROUP BY fecha",
+        database.path,
+        {"day": "2023-02-03"},
+    )
+    day_data = feb.data[feb.data.index == "2023-02-03"]
+    assert day.loc[0, "total_hours"] == pytest.approx(day_data["trip_minutes"].sum() / 60)
+    assert day.loc[0, "bikes"] == day_data["idBike"].nunique()
+
+    addresses = database.query("SELECT DISTINCT address_lock FROM trips WHERE month = 1")
+    assert not addresses["address_lock"].str.contains("'").any()
+
+
+def test_indexes_used(database):
+    plan = database.query("EXPLAIN QUERY PLAN SELECT * FROM trips WHERE idBike = 1200")
+    assert plan["detail"].str.contains("trips_bike").any()
+
+
+def test_to_database_sample(database):
+    data = make_month_data(100).dropna(how="all")
+    strata = pd.DataFrame({"population": [100], "sampled": [100]})
+    with pytest.raises(ValueError):
+        BiciMad.from_dataframe(2, 23, data, strata).to_database(database)
@@ -0,0 +1,39 @@
+import pytest
+from tests.conftest import CSV, INDEX, LINK
+from UrlEMT.mirror import sync_mirror
+from UrlEMT.UrlEMT import UrlEMT
+
+
+def test_sync_and_serve_mirror(tmp_path, upstream, serve):
+    mirror_dir = tmp_path / "mirror"
+    downloaded = sync_mirror(mirror_dir, serve(upstream))
+    assert len(downloaded) == 2
+    assert sync_mirror(mirror_dir, serve(upstream)) == downloaded[:1]
+
+    mirror_url = serve(mirror_dir)
+    url_object = UrlEMT(base_url=mirror_url)
+    assert url_object.get_url(2, 23).startswith(f"{mirror_url}/getattachment/")
+    assert url_object.get_csv(2, 23).getvalue() == CSV
+
+
+def test_base_url_from_env(monkeypatch, upstream, serve):
+    base_url = serve(upstream)
+    monkeypatch.setenv(UrlEMT.BASE_URL_ENV, f"{base_url}/")
+    url_object = UrlEMT()
+    assert url_object.base_url == base_url
+    assert list(url_object.valid_urls) == ["23_02"]
+
+
+get_links_base_url_test_cases = [
+    ("http://mirror:8000", {"23_02": f"http://mirror:8000{LINK}"}),
+    (None, TypeError),
+]
+
+
+@pytest.mark.parametrize("base_url, expected", get_links_base_url_test_cases)
+def test_get_links_base_url(base_url, expected):
+    if isinstance(expected, type) and issubclass(expected, Exception):
+        with pytest.raises(expected):
+            UrlEMT.get_links(INDEX, base_url)
+    else:
+        assert UrlEMT.get_links(INDEX, base_url) == expected
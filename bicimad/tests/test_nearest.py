@@ -0,0 +1,139 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from BiciMad.BiciMad import BiciMad
+from BiciMad.nearest import EARTH_RADIUS_M, StationIndex, station_coordinates
+
+station_index_test_cases = [50, 150, 400]
+
+
+def brute_force(st_lon, st_lat, lon, lat, max_distance):
+    lat0 = np.radians(st_lat.mean())
+    x = np.radians(lon[:, None] - st_lon) * np.cos(lat0)
+    y = np.radians(lat[:, None] - st_lat)
+    dist = EARTH_RADIUS_M * np.sqrt(x**2 + y**2)
+    nearest = dist.argmin(axis=1)
+    return np.where(dist.min(axis=1) <= max_distance, nearest.astype(np.float64), np.nan)
+
+
+@pytest.mark.parametrize("max_distance", station_index_test_cases)
+def test_station_index(max_distance):
+    rng = np.random.default_rng(max_distance)
+    st_lon, st_lat = -3.70 + rng.uniform(-0.03, 0.03, 300), 40.42 + rng.uniform(-0.03, 0.03, 300)
+    lon, lat = -3.70 + rng.uniform(-0.04, 0.04, 5000), 40.42 + rng.uniform(-0.04, 0.04, 5000)
+    lon[:3] = np.nan
+
+    index = StationIndex(np.arange(300), st_lon, st_lat, max_distance)
+    nearest, distance = index.query(lon, lat, chunk_size=1000)
+    expected = brute_force(st_lon, st_lat, lon, lat, max_distance)
+    np.testing.assert_array_equal(nearest.astype(np.float64), expected)
+    assert np.all(np.isnan(distance) == np.isnan(expected))
+    assert np.nanmax(distance) <= max_distance
+
+
+@pytest.mark.parametrize("max_distance", [0.5, 100])
+def test_station_index_outlier(max_distance):
+    rng = np.random.default_rng(0)
+    st_lon, st_lat = -3.70 + rng.uniform(-0.03, 0.03, 300), 40.42 + rng.uniform(-0.03, 0.03, 300)
+    st_lon[0], st_lat[0] = 0.0, 0.0
+    lon, lat = st_lon[:100] + 1e-6, st_lat[:100]
+    lon = np.concatenate([lon, -3.70 + rng.uniform(-0.04, 0.04, 2000)])
+    lat = np.concatenate([lat, 40.42 + rng.uniform(-0.04, 0.04, 2000)])
+
+    index = StationIndex(np.arange(300), st_lon, st_lat, max_distance)
+    assert index._table.nbytes < 100_000
+    nearest, _ = index.query(lon, lat)
+    expected = brute_force(st_lon, st_lat, lon, lat, max_distance)
+    np.testing.assert_array_equal(nearest.astype(np.float64), expected)
+    assert nearest[0] == 0
+
+
+def test_station_index_crowded_cells(monkeypatch):
+    # With a 3 km threshold every station shares a handful of cells, so each point has
+    # thousands of candidates and the chunks have to shrink to stay under the budget.
+    monkeypatch.setattr("BiciMad.nearest.MAX_CANDIDATES", 100_000)
+    rng = np.random.default_rng(1)
+    st_lon, st_lat = -3.70 + rng.uniform(-0.03, 0.03, 600), 40.42 + rng.uniform(-0.03, 0.03, 600)
+    lon, lat = -3.70 + rng.uniform(-0.04, 0.04, 5000), 40.42 + rng.uniform(-0.04, 0.04, 5000)
+
+    index = StationIndex(np.arange(600), st_lon, st_lat, 3000)
+    tracemalloc.start()
+    nearest, _ = index.query(lon, lat)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    np.testing.assert_array_equal(
+        nearest.astype(np.float64), brute_force(st_lon, st_lat, lon, lat, 3000)
+    )
+    assert peak < 20_000_000
+
+
+def test_station_index_empty():
+    nearest, distance = StationIndex([], [], [], 100).query([-3.7], [40.4])
+    assert np.isnan(nearest.astype(np.float64)).all() and np.isnan(distance).all()
+
+
+def make_dockless(month_data, rows, offset):
+    month_data = month_data.dropna(how="all").copy()
+    for side in ["unlock", "lock"]:
+        col = month_data.columns.get_loc(f"geolocation_{side}")
+        month_data.iloc[rows, col] = [
+            f"{{'type': 'Point', 'coordinates': [{-3.70 + offset}, {40.42 + offset}]}}"
+            if offset
+            else geolocation
+            for geolocation in month_data.iloc[rows, col]
+        ]
+        month_data.iloc[rows, month_data.columns.get_loc(f"station_{side}")] = np.nan
+        month_data.iloc[rows, month_data.columns.get_loc(f"{side}_station_name")] = np.nan
+        month_data.iloc[rows, month_data.columns.get_loc(f"address_{side}")] = "Dockless street"
+    return month_data
+
+
+assign_dockless_test_cases = [
+    (False, 0, 3),
+    (True, 0, 3),
+    (False, 1.0, 0),
+]
+
+
+@pytest.mark.parametrize("clean_first, offset, expected", assign_dockless_test_cases)
+def test_assign_dockless_stations(month_data, clean_first, offset, expected):
+    rows = [0, 2, 4]
+    original = month_data.dropna(how="all")[["station_unlock", "lock_station_name"]]
+    bicimad_obj = BiciMad.from_dataframe(2, 23, make_dockless(month_data, rows, offset))
+    if clean_first:
+        bicimad_obj.clean()
+
+    assigned = bicimad_obj.assign_dockless_stations(100)
+    assert assigned["unlock"] == assigned["lock"] == expected
+    if expected:
+        result = bicimad_obj.data.iloc[rows]
+        expected_ids = original["station_unlock"].iloc[rows]
+        if clean_first:
+            expected_ids = expected_ids.astype(int).astype(str)
+        np.testing.assert_array_equal(result["station_unlock"], expected_ids)
+        np.testing.assert_array_equal(
+            result["lock_station_name"], original["lock_station_name"].iloc[rows]
+        )
+        reference = BiciMad.from_dataframe(2, 23, month_data.dropna(how="all"))
+        if clean_first:
+            reference.clean()
+        np.testing.assert_array_equal(
+            result[["address_unlock", "address_lock"]],
+            reference.data[["address_unlock", "address_lock"]].iloc[rows],
+        )
+
+
+def test_assign_dockless_stations_errors(month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    with pytest.raises(TypeError):
+        bicimad_obj.assign_dockless_stations("100")
+    bicimad_obj.normalize()
+    with pytest.raises(ValueError):
+        bicimad_obj.assign_dockless_stations()
+
+
+def test_station_coordinates(month_data):
+    coordinates = station_coordinates(month_data)
+    assert coordinates.index.is_unique
+    assert coordinates.shape == (month_data["station_unlock"].nunique(), 2)
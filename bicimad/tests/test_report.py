@@ -0,0 +1,31 @@
+import pytest
+from BiciMad.BiciMad import BiciMad
+from BiciMad.synthetic import make_month_data
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+report_test_cases = [
+    (2, 23, True),
+    (5, 22, False),
+    (7, 21, True),
+]
+
+
+@pytest.mark.parametrize("month, year, unlock_st", report_test_cases)
+def test_report(month, year, unlock_st):
+    data = make_month_data(3000, month, year, seed=month)
+    result = BiciMad.from_dataframe(month, year, data.copy()).report(unlock_st)
+    bicimad_obj = BiciMad.from_dataframe(month, year, data.copy())
+
+    assert_series_equal(result["resume"], bicimad_obj.resume(unlock_st))
+    assert_series_equal(result["day_time"], bicimad_obj.day_time())
+    assert_series_equal(result["weekday_time"], bicimad_obj.weekday_time())
+    assert_series_equal(result["total_usage_day"], bicimad_obj.total_usage_day())
+    assert_frame_equal(
+        result["usage_by_date_and_unlock_st"], bicimad_obj.usage_by_date_and_unlock_st()
+    )
+
+
+def test_report_errors():
+    bicimad_obj = BiciMad.from_dataframe(2, 23, make_month_data(100))
+    with pytest.raises(TypeError):
+        bicimad_obj.report("True")
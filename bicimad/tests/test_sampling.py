@@ -0,0 +1,137 @@
+import io
+
+import numpy as np
+import pytest
+from BiciMad.BiciMad import BiciMad
+from BiciMad.sampling import stratified_sample, stratum_ids
+from BiciMad.schemas import TRIPS_V1, read_chunks
+from BiciMad.synthetic import make_month_data
+from pandas.testing import assert_frame_equal
+from sketches import SketchStore
+
+
+def sample_csv(data, sample_size, seed, chunksize=5000):
+    csv_file = io.StringIO()
+    data.to_csv(csv_file, sep=";")
+    return stratified_sample(read_chunks(csv_file, TRIPS_V1, chunksize), sample_size, seed)
+
+
+@pytest.fixture(scope="module")
+def large_month():
+    return make_month_data(40_000, seed=7)
+
+
+stratified_sample_test_cases = [(2000, 0), (2000, 1), (8000, 3)]
+
+
+@pytest.mark.parametrize("sample_size, seed", stratified_sample_test_cases)
+def test_stratified_sample(large_month, sample_size, seed):
+    sample, strata = sample_csv(large_month, sample_size, seed)
+    trips = large_month.dropna(how="all")
+
+    assert strata["population"].sum() == trips.shape[0]
+    assert sample.shape[0] == strata["sampled"].sum()
+    assert sample_size <= sample.shape[0] <= sample_size + strata.shape[0]
+    assert (strata["sampled"] >= 1).all()
+    expected_share = strata["population"] / strata["population"].sum()
+    actual_share = strata["sampled"] / strata["sampled"].sum()
+    assert np.abs(expected_share - actual_share).max() < 0.01
+    assert list(sample.columns) == list(large_month.columns)
+
+
+def test_stratified_sample_reproducible(large_month):
+    first, _ = sample_csv(large_month, 1000, 5)
+    second, _ = sample_csv(large_month, 1000, 5, chunksize=1234)
+    other, _ = sample_csv(large_month, 1000, 6)
+    assert_frame_equal(first, second)
+    assert not first["unlock_date"].equals(other["unlock_date"])
+
+
+@pytest.mark.parametrize("chunksize", [200, 1000])
+def test_stratified_sample_chunking(chunksize):
+    # A large sample read in small chunks: strata still filling must not lose candidates.
+    data = make_month_data(20_000, seed=3)
+    chunks = (data.iloc[start : start + chunksize] for start in range(0, len(data), chunksize))
+    single, single_strata = stratified_sample([data], 8000, 2)
+    chunked, chunked_strata = stratified_sample(chunks, 8000, 2)
+    assert_frame_equal(single, chunked)
+    assert_frame_equal(single_strata, chunked_strata)
+
+
+def test_stratified_sample_errors():
+    with pytest.raises(ValueError):
+        stratified_sample([], 10)
+    with pytest.raises(ValueError):
+        stratified_sample([make_month_data(10)], 0)
+
+
+def test_stratum_ids(month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data.dropna(how="all").copy())
+    before = stratum_ids(bicimad_obj.data.index, bicimad_obj.data["station_unlock"])
+    bicimad_obj.clean()
+    after = stratum_ids(bicimad_obj.data.index, bicimad_obj.data["station_unlock"])
+    np.testing.assert_array_equal(before, after)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_sample_estimates(large_month, seed):
+    sample, strata = sample_csv(large_month, 4000, seed)
+    bicimad_obj = BiciMad.from_dataframe(2, 23, sample, strata)
+    estimates = bicimad_obj.sample_estimates(0.99)
+    trips = large_month.dropna(how="all")
+
+    assert estimates.loc["total_uses", "estimate"] == trips.shape[0]
+    total_time = trips["trip_minutes"].sum()
+    assert estimates.loc["total_time", "ci_low"] <= total_time
+    assert total_time <= estimates.loc["total_time", "ci_high"]
+
+    daily = bicimad_obj.daily_estimates()
+    exact_hours = trips.groupby(trips.index)["trip_minutes"].sum() / 60
+    np.testing.assert_array_equal(daily["total_usage"], trips.groupby(trips.index).size())
+    coverage = ((daily["ci_low"] <= exact_hours) & (exact_hours <= daily["ci_high"])).mean()
+    assert coverage > 0.8
+
+
+def test_sample_estimates_normalized(large_month):
+    sample, strata = sample_csv(large_month, 1000, 0)
+    expected = BiciMad.from_dataframe(2, 23, sample.copy(), strata)
+    bicimad_obj = BiciMad.from_dataframe(2, 23, sample, strata)
+    bicimad_obj.normalize()
+    assert_frame_equal(bicimad_obj.sample_estimates(), expected.sample_estimates())
+    assert_frame_equal(bicimad_obj.daily_estimates(), expected.daily_estimates())
+    with pytest.raises(ValueError):
+        expected.assign_dockless_stations()
+
+
+def test_sample_estimates_errors(month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    with pytest.raises(ValueError):
+        bicimad_obj.sample_estimates()
+    with pytest.raises(ValueError):
+        bicimad_obj.daily_estimates()
+
+
+sampled_totals_test_cases = [
+    "resume",
+    "day_time",
+    "total_usage_day",
+    "report",
+    "rolling_usage",
+    "trip_minutes_digests",
+]
+
+
+@pytest.mark.parametrize("method", sampled_totals_test_cases)
+def test_sampled_totals_errors(large_month, method):
+    sample, strata = sample_csv(large_month, 1000, 0)
+    bicimad_obj = BiciMad.from_dataframe(2, 23, sample, strata)
+    with pytest.raises(ValueError, match="sample_estimates"):
+        getattr(bicimad_obj, method)()
+
+
+def test_sampled_sketches_errors(tmp_path, large_month):
+    sample, strata = sample_csv(large_month, 1000, 0)
+    bicimad_obj = BiciMad.from_dataframe(2, 23, sample, strata)
+    with pytest.raises(ValueError, match="sample_estimates"):
+        bicimad_obj.save_sketches(SketchStore(tmp_path))
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,94 @@
+import io
+
+import pandas as pd
+import pytest
+from BiciMad.BiciMad import BiciMad
+from BiciMad.schemas import INVALID_NUMBERS, TRIPS_V1, check_header, get_schema, parse_csv
+from BiciMad.synthetic import make_month_data
+from pandas.testing import assert_frame_equal
+
+get_schema_test_cases = [
+    (6, 21, TRIPS_V1),
+    (2, 23, TRIPS_V1),
+    (10, 21, ValueError),
+    (5, 21, ValueError),
+    (3, 23, ValueError),
+]
+
+
+@pytest.mark.parametrize("month, year, expected", get_schema_test_cases)
+def test_get_schema(month, year, expected):
+    if isinstance(expected, type) and issubclass(expected, Exception):
+        with pytest.raises(expected):
+            get_schema(month, year)
+    else:
+        assert get_schema(month, year) is expected
+
+
+def to_csv(data: pd.DataFrame) -> io.StringIO:
+    csv_file = io.StringIO()
+    data.to_csv(csv_file, sep=";")
+    csv_file.seek(0)
+    return csv_file
+
+
+def test_parse_csv():
+    data = make_month_data(500)
+    extra = data.assign(
+        dock_unlock=1.0,
+        dock_lock=2.0,
+        unlock_date=data["unlock_date"].dt.strftime("%Y-%m-%dT%H:%M:%S"),
+    )
+    result = parse_csv(to_csv(extra), TRIPS_V1)
+
+    assert list(result.columns) == list(data.columns)
+    assert_frame_equal(result, data, check_index_type=False, check_dtype=False)
+    for col in ["unlock_date", "lock_date"]:
+        assert pd.api.types.is_datetime64_any_dtype(result[col])
+    assert pd.api.types.is_datetime64_any_dtype(result.index)
+
+
+def test_check_header_drift():
+    data = make_month_data(10).rename(columns={"trip_minutes": "minutes"})
+    with pytest.raises(ValueError, match="trip_minutes"):
+        check_header(to_csv(data), TRIPS_V1)
+
+
+parse_csv_errors_test_cases = [
+    ("unlock_date", "01/02/2023 00:00:10"),
+    ("trip_minutes", "five"),
+]
+
+
+@pytest.mark.parametrize("col, value", parse_csv_errors_test_cases)
+def test_parse_csv_errors(col, value):
+    data = make_month_data(10).astype({col: object})
+    data.iloc[0, data.columns.get_loc(col)] = value
+    with pytest.raises(ValueError):
+        parse_csv(to_csv(data), TRIPS_V1)
+
+
+parse_csv_coerce_test_cases = [
+    ("trip_minutes", "five"),
+    ("idBike", "bike"),
+    ("station_lock", "12b"),
+]
+
+
+@pytest.mark.parametrize("col, value", parse_csv_coerce_test_cases)
+def test_parse_csv_coerce(col, value):
+    data = make_month_data(10).astype({col: object})
+    data.iloc[0, data.columns.get_loc(col)] = value
+    result = parse_csv(to_csv(data), TRIPS_V1, "coerce")
+
+    assert pd.isna(result[col].iloc[0])
+    assert result[col].dtype == "float64"
+    assert result[INVALID_NUMBERS].tolist() == [True] + [False] * (data.shape[0] - 1)
+
+    bicimad_obj = BiciMad.from_dataframe(2, 23, result)
+    counts = bicimad_obj.validate()
+    assert counts["invalid_numbers"] == counts["total"] == 1
+    assert bicimad_obj.quarantine["reasons"].tolist() == ["invalid_numbers"]
+    assert INVALID_NUMBERS not in bicimad_obj.data.columns
+    assert INVALID_NUMBERS not in bicimad_obj.quarantine.columns
+    assert bicimad_obj.data.shape[0] == data.shape[0] - 1
@@ -0,0 +1,82 @@
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+import requests
+from tests.conftest import CSV
+from UrlEMT.session import HttpClient
+from UrlEMT.UrlEMT import UrlEMT
+
+
+def flaky_handler(failures, status=503):
+    calls = []
+
+    class FlakyHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            calls.append(self.headers.get("If-None-Match"))
+            if len(calls) <= failures:
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+            else:
+                self.send_response(200)
+                self.send_header("ETag", '"v1"')
+                self.send_header("Content-Length", "4")
+                self.end_headers()
+                self.wfile.write(b"body")
+
+        def log_message(self, format, *args):
+            pass
+
+    return FlakyHandler, calls
+
+
+def test_conditional_requests(upstream, serve):
+    client = HttpClient()
+    url_object = UrlEMT(base_url=serve(upstream), client=client)
+    assert url_object.client is client
+    assert url_object.get_csv(2, 23).getvalue() == CSV
+    assert client.revalidated == 0
+    assert url_object.get_csv(2, 23).getvalue() == CSV
+    assert client.revalidated == 1
+
+    client.clear()
+    assert url_object.get_csv(2, 23).getvalue() == CSV
+    assert client.revalidated == 1
+
+
+retry_test_cases = [
+    (0, 3, b"body"),
+    (2, 3, b"body"),
+    (4, 3, requests.HTTPError),
+    (1, 0, requests.HTTPError),
+]
+
+
+@pytest.mark.parametrize("failures, retries, expected", retry_test_cases)
+def test_retries(serve, failures, retries, expected):
+    handler, calls = flaky_handler(failures)
+    url = serve(handler=handler)
+    client = HttpClient(retries=retries, backoff_factor=0)
+    if isinstance(expected, type) and issubclass(expected, Exception):
+        with pytest.raises(expected):
+            client.get(url)
+        assert len(calls) == retries + 1
+    else:
+        assert client.get(url) == expected
+        assert len(calls) == failures + 1
+        assert client.get(url) == expected
+        assert calls[-1] == '"v1"'
+        assert client.revalidated == 1
+
+
+def test_max_entries(serve):
+    handler, calls = flaky_handler(0)
+    url = serve(handler=handler)
+    client = HttpClient(max_entries=0)
+    client.get(url)
+    client.get(url)
+    assert calls == [None, None]
+    assert client.revalidated == 0
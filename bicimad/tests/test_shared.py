@@ -0,0 +1,70 @@
+import multiprocessing
+import pickle
+
+import numpy as np
+import pytest
+from BiciMad.BiciMad import BiciMad
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+
+def worker_report(spec):
+    with BiciMad.attach(spec) as bicimad_obj:
+        return bicimad_obj.resume(True), bicimad_obj.total_usage_day()
+
+
+def test_publish_and_attach(month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    with bicimad_obj.publish() as shared:
+        with BiciMad.attach(shared.spec) as attached:
+            assert (attached.month, attached.year) == (2, 23)
+            assert_frame_equal(
+                attached.data.astype(bicimad_obj.data.dtypes), bicimad_obj.data, check_freq=False
+            )
+            minutes = attached.data["trip_minutes"].to_numpy()
+            assert not minutes.flags.writeable
+            with pytest.raises(ValueError):
+                minutes[0] = 1.0
+            del minutes
+        assert attached.data is None
+
+
+def test_attach_in_workers(month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    with bicimad_obj.publish() as shared:
+        with multiprocessing.get_context("spawn").Pool(2) as pool:
+            results = pool.map(worker_report, [shared.spec] * 2)
+
+    for resume, usage in results:
+        assert_series_equal(resume, bicimad_obj.resume(True))
+        assert_series_equal(usage, bicimad_obj.total_usage_day())
+        assert usage.sum() == np.count_nonzero(month_data["idBike"].notna())
+
+
+def test_publish_normalized(month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    bicimad_obj.normalize()
+    with bicimad_obj.publish() as shared:
+        with multiprocessing.get_context("spawn").Pool(1) as pool:
+            results = pool.map(worker_report, [shared.spec])
+        with BiciMad.attach(shared.spec) as attached:
+            assert_frame_equal(
+                attached.stations.astype(bicimad_obj.stations.dtypes), bicimad_obj.stations
+            )
+            assert_series_equal(
+                attached.trip_speeds()["distance_km"], bicimad_obj.trip_speeds()["distance_km"]
+            )
+
+    resume, usage = results[0]
+    assert_series_equal(resume, bicimad_obj.resume(True))
+    assert_series_equal(usage, bicimad_obj.total_usage_day())
+
+
+def test_spec_size(month_data):
+    data = month_data.copy()
+    data["geolocation_lock"] = [f"dockless {i}" for i in range(data.shape[0])]
+    bicimad_obj = BiciMad.from_dataframe(2, 23, data)
+    with bicimad_obj.publish() as shared:
+        assert len(pickle.dumps(shared.spec)) < 10_000
+        with BiciMad.attach(shared.spec) as attached:
+            geolocations = attached.data["geolocation_lock"].tolist()
+        assert geolocations == bicimad_obj.data["geolocation_lock"].tolist()
@@ -0,0 +1,165 @@
+import numpy as np
+import pytest
+from BiciMad.BiciMad import BiciMad
+from sketches import HyperLogLog, SketchStore, TDigest, month_range
+
+tdigest_quantile_test_cases = [
+    ("uniform", 0.5),
+    ("uniform", 0.95),
+    ("gamma", 0.5),
+    ("gamma", 0.99),
+    ("lognormal", 0.95),
+]
+
+
+def sample(distribution, size, seed):
+    rng = np.random.default_rng(seed)
+    if distribution == "uniform":
+        return rng.uniform(0, 60, size)
+    if distribution == "gamma":
+        return rng.gamma(2.0, 6.0, size)
+    return rng.lognormal(2.5, 1.0, size)
+
+
+@pytest.mark.parametrize("distribution, q", tdigest_quantile_test_cases)
+def test_tdigest_quantile(distribution, q):
+    values = sample(distribution, 100_000, 1)
+    digest = TDigest(200)
+    for chunk in np.array_split(values, 10):
+        digest.update(chunk)
+
+    exact_rank = np.searchsorted(np.sort(values), digest.quantile(q)) / values.size
+    assert abs(exact_rank - q) < 0.01
+    assert digest.centroids <= 200
+
+
+def test_tdigest_merge():
+    months = [sample("gamma", 30_000, seed) for seed in range(4)]
+    merged = TDigest()
+    for values in months:
+        digest = TDigest()
+        digest.update(values)
+        merged.merge(digest)
+
+    all_values = np.concatenate(months)
+    assert merged.count == all_values.size
+    result = merged.quantile([0.5, 0.95, 0.99])
+    expected = np.quantile(all_values, [0.5, 0.95, 0.99])
+    np.testing.assert_allclose(result, expected, rtol=0.02)
+
+
+tdigest_errors_test_cases = [
+    (1.5, ValueError),
+    (-0.1, ValueError),
+]
+
+
+@pytest.mark.parametrize("q, expected", tdigest_errors_test_cases)
+def test_tdigest_quantile_errors(q, expected):
+    digest = TDigest()
+    digest.update([1.0, 2.0])
+    with pytest.raises(expected):
+        digest.quantile(q)
+
+
+def test_tdigest_empty():
+    assert np.isnan(TDigest().quantile(0.5))
+    with pytest.raises(TypeError):
+        TDigest().merge([1, 2])
+
+
+month_range_test_cases = [
+    ((11, 21), (2, 22), [(11, 21), (12, 21), (1, 22), (2, 22)]),
+    ((5, 22), (5, 22), [(5, 22)]),
+    ((6, 22), (5, 22), []),
+]
+
+
+@pytest.mark.parametrize("start, end, expected", month_range_test_cases)
+def test_month_range(start, end, expected):
+    assert month_range(start, end) == expected
+
+
+def test_sketch_store(tmp_path, month_data):
+    store = SketchStore(tmp_path)
+    BiciMad.from_dataframe(2, 23, month_data.copy()).save_sketches(store)
+    BiciMad.from_dataframe(3, 23, month_data.copy()).save_sketches(store)
+
+    digests = store.load("tdigest", 2, 23)
+    assert "all" in digests and "station:1" in digests
+    merged = store.merged("tdigest", month_range((2, 23), (3, 23)))
+    minutes = month_data["trip_minutes"].dropna().to_numpy()
+    assert merged.count == 2 * minutes.size
+    assert merged.quantile(0.5) == pytest.approx(np.median(minutes), rel=0.02)
+    station = store.merged("tdigest", [(2, 23)], key="station:1")
+    minutes_1 = month_data.loc[month_data["station_unlock"] == 1, "trip_minutes"]
+    assert station.count == minutes_1.count()
+
+    with pytest.raises(KeyError):
+        store.merged("tdigest", [(2, 23)], key="unknown")
+    with pytest.raises(FileNotFoundError):
+        store.load("tdigest", 4, 23)
+
+
+hyperloglog_count_test_cases = [
+    (10, 14),
+    (1_000, 14),
+    (50_000, 14),
+    (200_000, 12),
+]
+
+
+@pytest.mark.parametrize("n_distinct, precision", hyperloglog_count_test_cases)
+def test_hyperloglog_count(n_distinct, precision):
+    rng = np.random.default_rng(n_distinct)
+    values = rng.permutation(np.repeat(np.arange(n_distinct), 3)).astype(str)
+    sketch = HyperLogLog(precision)
+    for chunk in np.array_split(values, 7):
+        sketch.update(chunk)
+
+    # 4 standard errors keeps the test deterministic-safe while checking the documented bound.
+    assert abs(sketch.count() - n_distinct) / n_distinct < 4 * sketch.relative_error
+
+
+def test_hyperloglog_merge():
+    first, second = HyperLogLog(), HyperLogLog()
+    first.update(np.arange(0, 30_000).astype(str))
+    second.update(np.arange(20_000, 50_000).astype(str))
+    merged = HyperLogLog.from_dict(first.to_dict()).merge(second)
+
+    assert abs(merged.count() - 50_000) / 50_000 < 4 * merged.relative_error
+    with pytest.raises(ValueError):
+        first.merge(HyperLogLog(10))
+    with pytest.raises(TypeError):
+        first.merge(TDigest())
+
+
+hyperloglog_precision_test_cases = [3, 19]
+
+
+@pytest.mark.parametrize("precision", hyperloglog_precision_test_cases)
+def test_hyperloglog_precision(precision):
+    with pytest.raises(ValueError):
+        HyperLogLog(precision)
+
+
+def test_distinct_bikes_sketches(tmp_path, month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data.copy())
+    sketches = bicimad_obj.distinct_bikes_sketches()
+    data = bicimad_obj.data
+
+    exact_days = data.groupby(data.index)["idBike"].nunique()
+    for day, exact in exact_days.items():
+        estimate = sketches[f"day:{day:%Y-%m-%d}"].count()
+        assert abs(estimate - exact) / exact < 4 * sketches["all"].relative_error
+    exact_stations = data.groupby("station_unlock")["idBike"].nunique()
+    for station, exact in exact_stations.items():
+        estimate = sketches[f"station:{station}"].count()
+        assert abs(estimate - exact) / exact < 4 * sketches["all"].relative_error
+
+    store = SketchStore(tmp_path)
+    bicimad_obj.save_sketches(store)
+    days = [f"day:2023-02-{day:02}" for day in range(1, 8)]
+    week = store.merged("hyperloglog", [(2, 23)], key=days)
+    exact_week = data.loc["2023-02-01":"2023-02-07", "idBike"].nunique()
+    assert abs(week.count() - exact_week) / exact_week < 4 * week.relative_error
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from BiciMad.BiciMad import BiciMad
+from BiciMad.geo import haversine, parse_coordinates
+from BiciMad.speed import trip_speeds
+
+haversine_test_cases = [
+    # Puerta del Sol to Atocha, about 1.6 km.
+    ((-3.7038, 40.4168, -3.6906, 40.4066), 1.592),
+    ((-3.7, 40.4, -3.7, 40.4), 0.0),
+    # A degree of latitude.
+    ((0.0, 0.0, 0.0, 1.0), 111.195),
+    ((np.nan, 40.4, -3.7, 40.4), np.nan),
+]
+
+
+@pytest.mark.parametrize("points, expected", haversine_test_cases)
+def test_haversine(points, expected):
+    result = haversine(*points) / 1000
+    if np.isnan(expected):
+        assert np.isnan(result)
+    else:
+        assert result == pytest.approx(expected, abs=1e-3)
+
+
+def test_trip_speeds_flags():
+    lon = np.array([-3.70, -3.70, -3.70, -3.70, np.nan])
+    lat = np.array([40.40, 40.40, 40.40, 40.40, 40.40])
+    lat_lock = lat + np.array([0.01, 0.01, 0.0, 0.01, 0.01])
+    minutes = np.array([6.0, 0.5, 0.0, 0.0, 6.0])
+    speeds = trip_speeds(lon, lat, lon, lat_lock, minutes, max_speed_kmh=40)
+
+    np.testing.assert_allclose(speeds["distance_km"][:4], [1.112, 1.112, 0, 1.112], atol=1e-3)
+    np.testing.assert_allclose(speeds["speed_kmh"][:2], [11.12, 133.43], atol=1e-2)
+    assert np.isnan(speeds["speed_kmh"][2:]).all()
+    assert speeds["implausible"].tolist() == [False, True, False, True, False]
+
+
+@pytest.mark.parametrize("normalize", [False, True])
+def test_trip_speeds(month_data, normalize):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data.copy())
+    if normalize:
+        bicimad_obj.normalize()
+    result = bicimad_obj.trip_speeds()
+
+    trips = month_data.dropna(how="all")
+    lon_unlock, lat_unlock = parse_coordinates(trips["geolocation_unlock"])
+    lon_lock, lat_lock = parse_coordinates(trips["geolocation_lock"])
+    expected = [
+        haversine(x1, y1, x2, y2) / 1000
+        for x1, y1, x2, y2 in zip(lon_unlock, lat_unlock, lon_lock, lat_lock)
+    ]
+    assert result.shape[0] == trips.shape[0]
+    np.testing.assert_allclose(result["distance_km"], expected)
+    np.testing.assert_allclose(
+        result["speed_kmh"], result["distance_km"] / (trips["trip_minutes"].to_numpy() / 60)
+    )
+
+
+speed_stats_test_cases = ["day", "station_unlock", "station_lock", ("station", ValueError)]
+
+
+@pytest.mark.parametrize("by", speed_stats_test_cases)
+def test_speed_stats(month_data, by):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    if isinstance(by, tuple):
+        with pytest.raises(by[1]):
+            bicimad_obj.speed_stats(by[0])
+        return
+
+    result = bicimad_obj.speed_stats(by, max_speed_kmh=20)
+    speeds = bicimad_obj.trip_speeds(20).assign(minutes=bicimad_obj.data["trip_minutes"])
+    keys = speeds.index if by == "day" else bicimad_obj.data[by].to_numpy()
+    groups = speeds.groupby(keys)
+    plausible = speeds[~speeds["implausible"]].groupby(
+        keys[~speeds["implausible"].to_numpy()]
+    )
+    expected = pd.DataFrame(
+        {
+            "trips": groups.size(),
+            "distance_km": groups["distance_km"].sum(),
+            "mean_distance_km": groups["distance_km"].mean(),
+            "mean_speed_kmh": plausible["distance_km"].sum() / (plausible["minutes"].sum() / 60),
+            "implausible": groups["implausible"].sum(),
+        }
+    )
+    assert result["trips"].sum() == month_data.dropna(how="all").shape[0]
+    np.testing.assert_allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+    assert result["implausible"].sum() > 0
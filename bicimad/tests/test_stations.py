@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+from BiciMad.BiciMad import BiciMad
+from BiciMad.stations import join_stations, normalize_stations, station_column
+from pandas.testing import assert_frame_equal, assert_series_equal
+
+
+def test_normalize_stations(month_data):
+    stations, trips = normalize_stations(month_data)
+
+    assert stations.index.name == "station_key"
+    assert trips["unlock_key"].dtype == trips["lock_key"].dtype == np.int32
+    assert "address_unlock" not in trips.columns
+    docked = stations.dropna(subset=["station"])
+    assert docked["station"].is_unique
+    assert docked[["longitude", "latitude"]].notna().all().all()
+    joined = join_stations(trips, stations)[month_data.columns]
+    assert_frame_equal(joined, month_data, check_dtype=False)
+
+
+def test_station_column_errors(month_data):
+    stations, trips = normalize_stations(month_data)
+    with pytest.raises(KeyError):
+        station_column(stations, trips, "idBike")
+
+
+normalized_methods_test_cases = [
+    ("info_most_popular_stations", (True,)),
+    ("info_most_popular_stations", (False,)),
+    ("resume", (False,)),
+    ("usage_by_date_and_unlock_st", ()),
+]
+
+
+@pytest.mark.parametrize("method, args", normalized_methods_test_cases)
+def test_normalized_methods(month_data, method, args):
+    expected = getattr(BiciMad.from_dataframe(2, 23, month_data.copy()), method)(*args)
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data.copy())
+    bicimad_obj.normalize()
+    result = getattr(bicimad_obj, method)(*args)
+
+    assert bicimad_obj.stations is not None
+    if method == "resume":
+        assert_series_equal(result, expected)
+    else:
+        assert_frame_equal(result, expected, check_dtype=False, check_index_type=False)
+
+
+def test_normalized_report(month_data):
+    expected = BiciMad.from_dataframe(2, 23, month_data.copy()).report(True)
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data.copy())
+    bicimad_obj.normalize()
+    result = bicimad_obj.report(True)
+    assert_series_equal(result["resume"], expected["resume"])
+    assert result["usage_by_date_and_unlock_st"].equals(expected["usage_by_date_and_unlock_st"])
+
+
+bump_after_normalize_test_cases = ["clear_cache", "delete_nan_rows", "validate"]
+
+
+@pytest.mark.parametrize("method", bump_after_normalize_test_cases)
+def test_version_bump_after_normalize(month_data, method):
+    expected = BiciMad.from_dataframe(2, 23, month_data.copy())
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data.copy())
+    bicimad_obj.normalize()
+    getattr(bicimad_obj, method)()
+
+    assert_series_equal(bicimad_obj.resume(True), expected.resume(True))
+    assert_series_equal(bicimad_obj.day_time(), expected.day_time())
+    result = bicimad_obj.report(True)["usage_by_date_and_unlock_st"]
+    assert result.equals(expected.report(True)["usage_by_date_and_unlock_st"])
+
+
+def test_validate_normalized(month_data):
+    data = month_data.copy()
+    data.iloc[0, data.columns.get_loc("geolocation_lock")] = "not a point"
+    data.iloc[2, data.columns.get_loc("trip_minutes")] = -1.0
+    expected = BiciMad.from_dataframe(2, 23, data.copy())
+    expected_counts = expected.validate()
+    bicimad_obj = BiciMad.from_dataframe(2, 23, data.copy())
+    bicimad_obj.normalize()
+    counts = bicimad_obj.validate()
+
+    assert_series_equal(counts, expected_counts)
+    assert "geolocation_lock" not in bicimad_obj.data.columns
+    assert bicimad_obj.quarantine["geolocation_lock"].iloc[0] == "not a point"
+    assert_series_equal(bicimad_obj.resume(True), expected.resume(True))
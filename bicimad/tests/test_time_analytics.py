@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from BiciMad.BiciMad import BiciMad
+from pandas.testing import assert_series_equal
+
+rolling_usage_test_cases = [1, 3, 7, ("7", TypeError), (0, ValueError)]
+
+
+@pytest.mark.parametrize("window", rolling_usage_test_cases)
+def test_rolling_usage(month_data, window):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    if isinstance(window, tuple):
+        with pytest.raises(window[1]):
+            bicimad_obj.rolling_usage(window[0])
+        return
+
+    result = bicimad_obj.rolling_usage(window)
+    trips = month_data.dropna(how="all").set_index("unlock_date")["trip_minutes"]
+    daily = trips.resample("1D")
+    expected_trips = daily.count().astype(np.int64)
+    expected_minutes = daily.sum()
+    assert_series_equal(result["trips"], expected_trips, check_names=False, check_freq=False)
+    assert_series_equal(result["minutes"], expected_minutes, check_names=False, check_freq=False)
+    assert_series_equal(
+        result["minutes_rolling_mean"],
+        expected_minutes.rolling(window).mean(),
+        check_names=False,
+        check_freq=False,
+    )
+    assert_series_equal(
+        result["trips_rolling_sum"],
+        expected_trips.astype(float).rolling(window).sum(),
+        check_names=False,
+        check_freq=False,
+    )
+
+
+hour_weekday_matrix_test_cases = [("trips", "size"), ("minutes", "sum"), ("other", ValueError)]
+
+
+@pytest.mark.parametrize("values, expected", hour_weekday_matrix_test_cases)
+def test_hour_weekday_matrix(month_data, values, expected):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    if isinstance(expected, type) and issubclass(expected, Exception):
+        with pytest.raises(expected):
+            bicimad_obj.hour_weekday_matrix(values)
+        return
+
+    result = bicimad_obj.hour_weekday_matrix(values)
+    trips = month_data.dropna(how="all")
+    unlock = trips["unlock_date"]
+    weekdays = unlock.apply(BiciMad.get_weekday)
+    grouped = trips["trip_minutes"].groupby([weekdays, unlock.dt.hour]).agg(expected)
+    assert result.shape == (7, 24)
+    assert list(result.index) == ["L", "M", "X", "J", "V", "S", "D"]
+    for (weekday, hour), value in grouped.items():
+        assert result.loc[weekday, hour] == pytest.approx(value)
+    assert result.to_numpy().sum() == pytest.approx(grouped.sum())
+
+
+def test_peak_hours(month_data):
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+    matrix = bicimad_obj.hour_weekday_matrix()
+    result = bicimad_obj.peak_hours(2)
+
+    assert result.shape == (14, 3)
+    for weekday, peaks in result.groupby("weekday", sort=False):
+        assert peaks["trips"].iloc[0] == matrix.loc[weekday].max()
+        assert peaks["trips"].is_monotonic_decreasing
+        assert (matrix.loc[weekday, peaks["hour"]].to_numpy() == peaks["trips"]).all()
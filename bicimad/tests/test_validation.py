@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from BiciMad.BiciMad import BiciMad
+from BiciMad.geo import parse_coordinates
+
+parse_coordinates_test_cases = [
+    ("{'type': 'Point', 'coordinates': [-3.6956178, 40.4190003]}", (-3.6956178, 40.4190003)),
+    ("{'type': 'Point', 'coordinates': [-3.7, 40]}", (-3.7, 40.0)),
+    ("{'type': 'Point', 'coordinates': [-3.7, 140.1]}", (np.nan, np.nan)),
+    ("{'type': 'Point', 'coordinates': []}", (np.nan, np.nan)),
+    ("not a geolocation", (np.nan, np.nan)),
+    (np.nan, (np.nan, np.nan)),
+]
+
+
+@pytest.mark.parametrize("geolocation, expected", parse_coordinates_test_cases)
+def test_parse_coordinates(geolocation, expected):
+    lon, lat = parse_coordinates(pd.Series([geolocation, geolocation]))
+    np.testing.assert_array_equal(lon, [expected[0]] * 2)
+    np.testing.assert_array_equal(lat, [expected[1]] * 2)
+
+
+validate_test_cases = [
+    ("trip_minutes", -2.0, "negative_trip_minutes"),
+    ("trip_minutes", 5000.0, "absurd_trip_minutes"),
+    ("lock_date", pd.Timestamp("2023-01-01"), "lock_before_unlock"),
+    ("unlock_date", pd.NaT, "missing_dates"),
+    ("geolocation_unlock", "{'type': 'Point'}", "invalid_geolocation_unlock"),
+    ("geolocation_lock", np.nan, "invalid_geolocation_lock"),
+]
+
+
+@pytest.mark.parametrize("col, value, reason", validate_test_cases)
+def test_validate(month_data, col, value, reason):
+    month_data.iloc[[0, 10], month_data.columns.get_loc(col)] = value
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data.copy())
+
+    counts = bicimad_obj.validate()
+    assert counts[reason] == counts["total"] == 2
+    assert bicimad_obj.quarantine.shape[0] == 2
+    assert (bicimad_obj.quarantine["reasons"] == reason).all()
+    assert bicimad_obj.data.shape[0] == month_data.shape[0] - 2
+
+
+def test_validate_wrong_month(month_data):
+    bicimad_obj = BiciMad.from_dataframe(3, 23, month_data.copy())
+    counts = bicimad_obj.validate()
+    assert counts["wrong_month"] == month_data["idBike"].notna().sum()
+    assert bicimad_obj.data["idBike"].isna().all()
+
+    bicimad_obj.clean()
+    assert bicimad_obj.data.shape[0] == 0
+
+
+def test_validate_several_reasons(month_data):
+    month_data.iloc[0, month_data.columns.get_loc("trip_minutes")] = -1.0
+    month_data.iloc[0, month_data.columns.get_loc("geolocation_lock")] = "nowhere"
+    bicimad_obj = BiciMad.from_dataframe(2, 23, month_data)
+
+    counts = bicimad_obj.validate(max_trip_minutes=30)
+    quarantine = bicimad_obj.quarantine
+    assert quarantine["reasons"].iloc[0] == "negative_trip_minutes;invalid_geolocation_lock"
+    assert counts["absurd_trip_minutes"] == (month_data["trip_minutes"] > 30).sum()
+    with pytest.raises(TypeError):
+        bicimad_obj.validate("30")